@@ -1,10 +1,66 @@
+import asyncio
+
+
 class AsyncEventEmitter:
     def __init__(self):
+        # Listeners stored as tuples: cheap to iterate and safe to share with running emits
         self._listeners = {}
+        # Fire-and-forget listeners, started as tasks after the awaited ones
+        self._bg_listeners = {}
+        self._frozen = False
+        # Strong references to background tasks until they finish
+        self._tasks = set()
 
     def on(self, event_name, callback):
-        self._listeners.setdefault(event_name, []).append(callback)
+        self._check_frozen(event_name)
+        self._listeners[event_name] = (*self._listeners.get(event_name, ()), callback)
+
+    def on_background(self, event_name, callback):
+        # For slow, non-critical listeners (e.g. API calls) that emit should not wait for
+        self._check_frozen(event_name)
+        self._bg_listeners[event_name] = (*self._bg_listeners.get(event_name, ()), callback)
+
+    def freeze(self):
+        # Close registration once startup wiring is done
+        self._frozen = True
+
+    def _check_frozen(self, event_name):
+        if self._frozen:
+            raise RuntimeError(f"Cannot register listener for {event_name}: emitter is frozen")
 
     async def emit(self, event_name, *args, **kwargs):
-        for callback in self._listeners.get(event_name, []):
-            await callback(event_name, *args, **kwargs)
\ No newline at end of file
+        listeners = self._listeners.get(event_name)
+        if listeners:
+            # Run listeners concurrently; one failing listener must not cancel the others
+            results = await asyncio.gather(
+                *(callback(event_name, *args, **kwargs) for callback in listeners),
+                return_exceptions=True
+            )
+            for callback, result in zip(listeners, results):
+                if isinstance(result, Exception):
+                    self._report_failure(event_name, callback, result)
+
+        # Background listeners keep running after emit returns (the loop must stay alive)
+        for callback in self._bg_listeners.get(event_name, ()):
+            self._track(asyncio.create_task(callback(event_name, *args, **kwargs)), event_name, callback)
+
+    async def drain(self):
+        # Wait for running background listeners, e.g. before closing shared resources on shutdown
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _track(self, task, event_name, callback):
+        self._tasks.add(task)
+
+        def done(task):
+            self._tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                self._report_failure(event_name, callback, task.exception())
+
+        task.add_done_callback(done)
+        return task
+
+    @staticmethod
+    def _report_failure(event_name, callback, error):
+        name = getattr(callback, "__name__", callback)
+        print(f"Warning: Listener {name} failed for {event_name}: {error}")
@@ -1,15 +1,29 @@
 import RPi.GPIO as GPIO
+import asyncio
 import time
 from PIL import Image, ImageDraw, ImageFont
-import board
-import busio
 from adafruit_ssd1306 import SSD1306_I2C
 
+from cpu_affinity import pin_to_display_core
+from i2c_bus import create_i2c_bus
+
 class ButtonDisplayController:
     """
     Controller für Button-Display Interaktion auf Raspberry Pi 3
     """
     
+    READY_LINES = (
+        "System bereit",
+        "",
+        "Drücke Button",
+        "für Nachricht"
+    )
+    
+    # Entprellzeit der Flankenerkennung (ms)
+    BOUNCE_TIME_MS = 200
+    # Pin-Prüfung nach dem Drücken, etwas länger als die Entprellzeit (s)
+    RELEASE_CHECK_DELAY = 0.25
+    
     def __init__(self):
         # GPIO Setup - Prüfe aktuellen Modus und verwende ihn
         try:
@@ -45,7 +59,7 @@ class ButtonDisplayController:
         # Display Setup (I2C Pins: Pin 3 = SDA, Pin 5 = SCL)
         # Pin 17 = 3.3V, Pin 39 = GND
         try:
-            self.i2c = busio.I2C(board.SCL, board.SDA)
+            self.i2c = create_i2c_bus()
             self.display = SSD1306_I2C(128, 64, self.i2c)
             print("Display erfolgreich initialisiert")
         except Exception as e:
@@ -61,12 +75,33 @@ class ButtonDisplayController:
             self.font_large = ImageFont.load_default()
             self.font_small = ImageFont.load_default()
         
+        # Zeilen-Layout (Überschrift, restliche Zeilen): Font und Zeilenhöhe
+        self._row_fonts = (self.font_large, self.font_small)
+        self._row_heights = (20, 15)
+        
+        # multiline_text rückt pro Zeile um Höhe von "A" + spacing weiter
+        self._small_spacing = self._row_heights[1] - self.font_small.getbbox("A")[3]
+        
+        # Zentrierte x-Positionen pro (Font, Zeile), einmal gemessen
+        self._width_cache = {}
+        
+        # Pixel-Daten des zuletzt angezeigten Bildes
+        self._last_frame = None
+        
         # Status variablen
         self.button_pressed = False
-        self.last_button_state = True  # True = nicht gedrückt (Pull-up)
+        self._loop = None
+        self._ready_timer = None
+        self._release_check = None
         
         # Display initialisieren
         if self.display:
+            # Wiederverwendetes Zeichen-Bild, wird vor jedem Rendern geleert
+            self._scratch_image = Image.new("1", (self.display.width, self.display.height))
+            self._scratch_draw = ImageDraw.Draw(self._scratch_image)
+            
+            # Statische Bildschirme einmalig vorrendern (Kopie, da das Zeichen-Bild wiederverwendet wird)
+            self._ready_frame = self._render_text(self.READY_LINES).copy()
             self.clear_display()
             self.show_ready_message()
     
@@ -75,61 +110,94 @@ class ButtonDisplayController:
         if self.display:
             self.display.fill(0)
             self.display.show()
+            self._last_frame = None
     
-    def show_text(self, text_lines):
-        """Text auf Display anzeigen
+    def _render_text(self, text_lines):
+        """Text-Zeilen in das wiederverwendete Zeichen-Bild zeichnen
         
         Args:
             text_lines: Liste von Text-Zeilen zum Anzeigen
+        
+        Returns:
+            Das Zeichen-Bild, gültig bis zum nächsten Aufruf
         """
-        if not self.display:
-            print(f"Display nicht verfügbar. Text: {text_lines}")
-            return
+        # Zeichen-Bild leeren statt neu erstellen
+        image = self._scratch_image
+        draw = self._scratch_draw
+        draw.rectangle((0, 0, self.display.width, self.display.height), fill=0)
         
-        # Neues Bild erstellen
-        image = Image.new("1", (self.display.width, self.display.height))
-        draw = ImageDraw.Draw(image)
+        heading_font, body_font = self._row_fonts
         
-        # Text-Zeilen anzeigen
+        # Erste Zeile größer
         y_position = 5
-        for i, line in enumerate(text_lines):
-            if i == 0:  # Erste Zeile größer
-                font = self.font_large
-                line_height = 20
-            else:
-                font = self.font_small
-                line_height = 15
-            
-            # Text zentrieren (vereinfachte Methode)
+        if text_lines:
+            line = text_lines[0]
+            x_position = self._measure(draw, line, heading_font)
+            draw.text((x_position, y_position), line, font=heading_font, fill=255)
+            y_position += self._row_heights[0]
+        
+        # Restliche Zeilen mit gleichem Font in einem Aufruf, jede Zeile mittig ("ma" = Mitte oben)
+        if len(text_lines) > 1:
+            draw.multiline_text((self.display.width // 2, y_position), "\n".join(text_lines[1:]),
+                                font=body_font, fill=255, anchor="ma", align="center",
+                                spacing=self._small_spacing)
+        
+        return image
+    
+    def _measure(self, draw, line, font):
+        """Zentrierte x-Position einer Zeile (gecacht, da die Texte sich wiederholen)"""
+        key = (id(font), line)
+        x_position = self._width_cache.get(key)
+        if x_position is not None:
+            return x_position
+        
+        # Text zentrieren (vereinfachte Methode)
+        try:
+            # Neuere PIL Versionen
+            bbox = draw.textbbox((0, 0), line, font=font)
+            text_width = bbox[2] - bbox[0]
+        except AttributeError:
+            # Ältere PIL Versionen
             try:
-                # Neuere PIL Versionen
-                bbox = draw.textbbox((0, 0), line, font=font)
-                text_width = bbox[2] - bbox[0]
+                text_width = draw.textsize(line, font=font)[0]
             except AttributeError:
-                # Ältere PIL Versionen
-                try:
-                    text_width = draw.textsize(line, font=font)[0]
-                except AttributeError:
-                    # Fallback
-                    text_width = len(line) * 8
-            
-            x_position = max(0, (self.display.width - text_width) // 2)
-            
-            draw.text((x_position, y_position), line, font=font, fill=255)
-            y_position += line_height
+                # Fallback
+                text_width = len(line) * 8
+        
+        x_position = self._width_cache[key] = max(0, (self.display.width - text_width) // 2)
+        return x_position
+    
+    def _show_image(self, image):
+        """Bild auf Display anzeigen"""
+        # Gleiches Bild wie zuletzt: kein I2C-Transfer nötig
+        frame = image.tobytes()
+        if frame == self._last_frame:
+            return
+        self._last_frame = frame
         
-        # Auf Display anzeigen
         self.display.image(image)
         self.display.show()
     
+    def show_text(self, text_lines):
+        """Text auf Display anzeigen
+        
+        Args:
+            text_lines: Liste von Text-Zeilen zum Anzeigen
+        """
+        if not self.display:
+            print(f"Display nicht verfügbar. Text: {text_lines}")
+            return
+        
+        self._show_image(self._render_text(text_lines))
+    
     def show_ready_message(self):
         """Bereites-Status anzeigen"""
-        self.show_text([
-            "System bereit",
-            "",
-            "Drücke Button",
-            "für Nachricht"
-        ])
+        if not self.display:
+            print(f"Display nicht verfügbar. Text: {self.READY_LINES}")
+            return
+        
+        # Statischer Bildschirm, einmalig in __init__ vorgerendert
+        self._show_image(self._ready_frame)
     
     def show_button_pressed_message(self):
         """Nachricht wenn Button gedrückt wurde"""
@@ -140,39 +208,72 @@ class ButtonDisplayController:
             "Raspberry Pi 3"
         ])
     
-    def check_button(self):
-        """Button-Status prüfen und entsprechend reagieren"""
-        current_button_state = GPIO.input(self.BUTTON_PIN)
-        
-        # Button-Druck erkennen (Flanke von HIGH zu LOW)
-        if self.last_button_state == True and current_button_state == False:
-            print("Button wurde gedrückt!")
-            self.button_pressed = True
-            self.show_button_pressed_message()
-            time.sleep(0.2)  # Entprellen
-        
-        # Button losgelassen (nach 3 Sekunden zurück zum Ready-Status)
-        elif self.last_button_state == False and current_button_state == True:
-            print("Button wurde losgelassen!")
-            time.sleep(3)  # 3 Sekunden warten
-            self.show_ready_message()
-            self.button_pressed = False
-        
-        self.last_button_state = current_button_state
+    def _on_edge(self, channel):
+        """GPIO-Callback für beide Flanken (läuft im Thread von RPi.GPIO)"""
+        # LOW = gedrückt (Pull-up)
+        pressed = GPIO.input(channel) == GPIO.LOW
+        # Display-Zugriffe nur im Event-Loop
+        self._loop.call_soon_threadsafe(self._on_press if pressed else self._on_release)
+    
+    def _on_press(self):
+        """Button-Druck (Flanke von HIGH zu LOW)"""
+        if self.button_pressed:
+            return
+        print("Button wurde gedrückt!")
+        self.button_pressed = True
+        # Erneuter Druck innerhalb der 3 Sekunden: Ready-Status nicht mehr anzeigen
+        if self._ready_timer:
+            self._ready_timer.cancel()
+            self._ready_timer = None
+        self.show_button_pressed_message()
+        # Bei kurzem Tippen fällt die Loslass-Flanke in die bouncetime und wird
+        # verworfen: nach Ablauf den Pin selbst prüfen
+        self._release_check = self._loop.call_later(self.RELEASE_CHECK_DELAY, self._check_released)
+    
+    def _check_released(self):
+        """Loslassen nachholen, falls die Flanke in der bouncetime verloren ging"""
+        self._release_check = None
+        if GPIO.input(self.BUTTON_PIN) == GPIO.HIGH:
+            self._on_release()
     
-    def run(self):
+    def _on_release(self):
+        """Button losgelassen (nach 3 Sekunden zurück zum Ready-Status)"""
+        if not self.button_pressed:
+            return
+        print("Button wurde losgelassen!")
+        self.button_pressed = False
+        if self._release_check:
+            self._release_check.cancel()
+            self._release_check = None
+        # Nicht blockierend warten, der Event-Loop bleibt frei
+        self._ready_timer = self._loop.call_later(3.0, self._back_to_ready)
+    
+    def _back_to_ready(self):
+        """Nach der Wartezeit wieder Ready-Status anzeigen"""
+        self._ready_timer = None
+        self.show_ready_message()
+    
+    async def run(self):
         """Hauptschleife"""
+        self._loop = asyncio.get_running_loop()
         print("Button-Display Controller gestartet...")
         print(f"Button Pin: {self.BUTTON_PIN} ({'BCM' if self.use_bcm else 'BOARD'} Modus)")
         print("Drücke Ctrl+C zum Beenden")
         
+        # Flanken per Interrupt erkennen statt Polling (beide Flanken, Zustand im Callback lesen)
+        GPIO.add_event_detect(self.BUTTON_PIN, GPIO.BOTH, callback=self._on_edge, bouncetime=self.BOUNCE_TIME_MS)
+        
+        # Nur der Event-Loop zeichnet aufs Display: erst nach dem Start des
+        # GPIO-Callback-Threads pinnen, damit dieser die Affinität nicht erbt
+        pin_to_display_core()
+        
         try:
-            while True:
-                self.check_button()
-                time.sleep(0.1)  # Kurze Pause
+            # Warten bis zum Abbruch, Button-Events laufen über _on_edge
+            await asyncio.Event().wait()
         
-        except KeyboardInterrupt:
+        except asyncio.CancelledError:
             print("\nProgramm beendet")
+            raise
         
         finally:
             self.cleanup()
@@ -180,6 +281,11 @@ class ButtonDisplayController:
     def cleanup(self):
         """Aufräumen beim Beenden - GPIO nicht zurücksetzen wenn andere Scripts laufen"""
         print("Programm wird beendet...")
+        GPIO.remove_event_detect(self.BUTTON_PIN)
+        if self._ready_timer:
+            self._ready_timer.cancel()
+        if self._release_check:
+            self._release_check.cancel()
         if self.display:
             self.clear_display()
         # GPIO.cleanup() NICHT aufrufen, da andere Scripts möglicherweise noch laufen
@@ -188,4 +294,7 @@ class ButtonDisplayController:
 # Hauptprogramm
 if __name__ == "__main__":
     controller = ButtonDisplayController()
-    controller.run()
\ No newline at end of file
+    try:
+        asyncio.run(controller.run())
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
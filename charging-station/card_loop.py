@@ -0,0 +1,91 @@
+import asyncio
+import concurrent.futures
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+DEBOUNCE_TIME = 2.0  # 2 seconds cooldown between reads of the same tag
+
+
+@dataclass(slots=True)
+class TagState:
+    """Last processed tag, for debouncing repeated reads of the same card"""
+    last_tag_id: Optional[int] = None
+    last_read_time: float = 0.0  # time.monotonic() of the last processed read
+    # time.monotonic() when the last tap was handled, earlier reads are stale
+    ready_since: float = 0.0
+
+
+def should_process_tag(state, tag_id, now):
+    """
+    Check if we should process this tag based on debounce logic
+
+    Args:
+        state: TagState of the card loop
+        tag_id: The tag ID that was read
+        now: time.monotonic() of the read
+    """
+    if tag_id is None:
+        return False
+
+    # If it's a different tag, always process it
+    if tag_id != state.last_tag_id:
+        return True
+
+    # If it's the same tag, only process if enough time has passed
+    if now - state.last_read_time >= DEBOUNCE_TIME:
+        return True
+
+    return False
+
+
+def rfid_producer(loop, events, read):
+    """
+    Read cards on a dedicated thread and queue them for the event loop
+
+    read() blocks until a card is presented, so it runs in a daemon thread
+    (an executor thread would keep the process alive on shutdown). Each read
+    is queued with the time it was taken, so the card loop can tell reads
+    that waited in the queue while a tap was processed.
+
+    Args:
+        loop: The event loop running the card loop
+        events: asyncio.Queue of (tag_id, text, read_time) reads
+        read: Function returning (tag_id, text), (None, None) if the read failed
+    """
+    while True:
+        tag_id, text = read()
+        if tag_id is None:
+            continue
+        try:
+            asyncio.run_coroutine_threadsafe(events.put((tag_id, text, time.monotonic())), loop).result()
+        except (RuntimeError, concurrent.futures.CancelledError):
+            return  # Loop closed during shutdown
+
+
+async def run_card_loop(events, state, handle_tag):
+    """
+    Handle queued card reads one tap at a time
+
+    Reads taken while the previous tap was handled are dropped: a card held on
+    the reader for a normal tap must not stop (or restart) the session its
+    first read just started once handling took longer than DEBOUNCE_TIME.
+
+    Args:
+        events: asyncio.Queue filled by rfid_producer
+        state: TagState of the card loop
+        handle_tag: Coroutine function called with (tag_id, text) for each tap
+    """
+    while True:
+        tag_id, text, read_time = await events.get()
+        if read_time < state.ready_since:
+            continue
+
+        # Debounce on when the card was read, not when the read left the queue
+        if should_process_tag(state, tag_id, read_time):
+            state.last_tag_id = tag_id
+            state.last_read_time = read_time
+            try:
+                await handle_tag(tag_id, text)
+            finally:
+                state.ready_since = time.monotonic()
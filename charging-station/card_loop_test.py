@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Card Loop Test for the RFID read queue and debounce
+
+Simulates the reader thread with a card held on the reader while a slow tap
+is handled, no hardware needed.
+
+Usage:
+    python card_loop_test.py
+
+Exits with status 1 if a check fails.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+
+import card_loop
+from card_loop import TagState, rfid_producer, run_card_loop
+
+TAG_ID = 316922528399
+
+
+def held_card_reader(hold_seconds, poll_interval=0.01):
+    """Fake read_rfid(): the card is in the field for hold_seconds from the first read"""
+    t0 = time.monotonic()
+
+    def read():
+        time.sleep(poll_interval)
+        if time.monotonic() - t0 < hold_seconds:
+            return TAG_ID, "txt"
+        return None, None
+
+    return read
+
+
+async def run_taps(read, handle_seconds, run_seconds):
+    """Run the producer and card loop for run_seconds, return the handled taps"""
+    taps = []
+
+    async def handle_tag(tag_id, text):
+        taps.append(tag_id)
+        # Slow start or stop: token, contract and plan option requests
+        await asyncio.sleep(handle_seconds)
+
+    events = asyncio.Queue(maxsize=1)
+    threading.Thread(target=rfid_producer, args=(asyncio.get_running_loop(), events, read),
+                     name="rfid-read", daemon=True).start()
+    loop_task = asyncio.create_task(run_card_loop(events, TagState(), handle_tag))
+    await asyncio.sleep(run_seconds)
+    loop_task.cancel()
+    return taps
+
+
+def test_held_card_during_slow_tap():
+    """
+    A card held for a normal tap is handled once, even if handling the tap
+    takes longer than the debounce time
+    """
+    print("🧪 Testing a held card during a slow tap...")
+    card_loop.DEBOUNCE_TIME = 0.2
+    # Card held 0.3 s, handling takes 0.5 s: the reads queued meanwhile are stale
+    taps = asyncio.run(run_taps(held_card_reader(0.3), handle_seconds=0.5, run_seconds=1.0))
+    print(f"   {len(taps)} tap(s) handled")
+    assert len(taps) == 1, taps
+
+
+async def run_queued_reads(reads, delay):
+    """Feed (read_time offset, tag_id) reads to the card loop, consumed delay seconds late"""
+    taps = []
+
+    async def handle_tag(tag_id, text):
+        taps.append(tag_id)
+
+    events = asyncio.Queue()
+    loop_task = asyncio.create_task(run_card_loop(events, TagState(), handle_tag))
+    t0 = time.monotonic()
+    for offset, tag_id in reads:
+        await events.put((tag_id, "txt", t0 + offset))
+        # The card loop only gets to the read after it waited in the queue
+        await asyncio.sleep(delay)
+    loop_task.cancel()
+    return taps
+
+
+def test_debounce_uses_read_time():
+    """
+    A repeated read within the debounce time is dropped even if it is taken
+    from the queue after the debounce time passed
+    """
+    print("🧪 Testing debounce on the read time...")
+    card_loop.DEBOUNCE_TIME = 0.2
+    taps = asyncio.run(run_queued_reads([(0.0, TAG_ID), (0.1, TAG_ID), (0.3, TAG_ID)], delay=0.25))
+    print(f"   {len(taps)} tap(s) handled")
+    # Reads 0.1 s apart are one tap, 0.3 s is a new tap
+    assert len(taps) == 2, taps
+
+
+if __name__ == "__main__":
+    try:
+        test_held_card_during_slow_tap()
+        test_debounce_uses_read_time()
+    except AssertionError as e:
+        print(f"❌ Unexpected taps: {e}")
+        sys.exit(1)
+    print("✅ Card loop checks passed")
@@ -0,0 +1,39 @@
+import os
+
+# Core reserved for display/button work. Keep the scheduler off it with
+# isolcpus=3 in /boot/cmdline.txt (same line, space separated, reboot required)
+DISPLAY_CPU = 3
+DISPLAY_NICE = -5
+
+
+def pin_to_display_core(cpu=DISPLAY_CPU):
+    """
+    Pin the calling thread to the display core and raise its priority
+
+    Threads started afterwards inherit the affinity, so call it from the thread
+    doing the display work, not at import or from the main thread. Does nothing
+    on systems without sched_setaffinity or without that core (e.g. single-core Pi Zero).
+
+    Args:
+        cpu: Core to run on
+
+    Returns:
+        bool: True if the affinity was set
+    """
+    if not hasattr(os, "sched_setaffinity") or cpu >= (os.cpu_count() or 1):
+        return False
+
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError as e:
+        print(f"Warning: Could not pin to CPU {cpu}: {e}")
+        return False
+
+    # Negative nice values need root
+    if os.geteuid() == 0:
+        try:
+            os.nice(DISPLAY_NICE)
+        except OSError as e:
+            print(f"Warning: Could not raise priority: {e}")
+
+    return True
@@ -1,20 +1,153 @@
 from PIL import Image, ImageDraw, ImageFont
-import board
-import busio
 from adafruit_ssd1306 import SSD1306_I2C
+import sys
+import threading
 import time
 
+from i2c_bus import create_i2c_bus
+
+# Map quantity types to shorter versions
+_QTY_MAP = {sys.intern(k): v for k, v in {
+    "MINUTE": "min",
+    "SECOND": "sec",
+    "HOUR": "hr",
+    "KILOWATT_HOUR": "kWh",
+    "UNIT": "unit"
+}.items()}
+
+# 8x8 icons used instead of symbol glyphs, one byte per row with the leftmost
+# pixel in the highest bit (XBM order reversed per byte)
+ICONS = {
+    "bolt": bytes.fromhex("060c183e0c183060"),
+    "check": bytes.fromhex("00010386cc783000"),
+    "warn": bytes.fromhex("183c5a5a998199ff"),
+}
+
+# Same icons as display columns (bit 0 = top row) for blitting into page buffers
+_ICON_COLUMNS = {
+    name: tuple(
+        sum(((row >> (7 - col)) & 1) << y for y, row in enumerate(rows))
+        for col in range(8)
+    )
+    for name, rows in ICONS.items()
+}
+
+
+class GlyphCache:
+    """
+    Pre-rasterized 1-bit glyphs of one font, rendered lazily per character
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self._glyphs = {}
+
+    def get(self, char):
+        """Return (advance, left, top, columns) for a character
+
+        Each column is an int holding the glyph's vertical pixels, bit 0 = top row.
+        """
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            glyph = self._glyphs[char] = self._rasterize(char)
+        return glyph
+
+    def _rasterize(self, char):
+        """Render a single character the way ImageDraw.text places it inside a string"""
+        advance = round(self.font.getlength(char, mode="1"))
+
+        # Draw after a space: a lone glyph gets shifted by its own bearing
+        prefix = round(self.font.getlength(" ", mode="1"))
+        text = " " + char
+        _, _, right, bottom = self.font.getbbox(text, mode="1")
+        image = Image.new("1", (max(right, 1), max(bottom, 1)))
+        ImageDraw.Draw(image).text((0, 0), text, font=self.font, fill=255)
+
+        bbox = image.getbbox()
+        if bbox is None:
+            return advance, 0, 0, ()
+        left, top, right, bottom = bbox
+        glyph = image.crop(bbox)
+
+        # One packed row per glyph column after transposing, top pixel in the lowest bit
+        column_bytes = (bottom - top + 7) // 8
+        data = glyph.transpose(Image.Transpose.TRANSPOSE).tobytes("raw", "1;R")
+        columns = tuple(
+            int.from_bytes(data[i:i + column_bytes], "little")
+            for i in range(0, len(data), column_bytes)
+        )
+        return advance, left - prefix, top, columns
+
+
+def _blit_columns(buf, x, y, columns, width):
+    """OR pixel columns (bit 0 = top) into an SSD1306 page buffer at (x, y)"""
+    if not columns or y >= len(buf) // width * 8:
+        return
+
+    # Shift each column into place and spread it over the 8-pixel pages
+    if y < 0:
+        page, shift = 0, y
+    else:
+        page, shift = y >> 3, y & 7
+    for bits in columns:
+        if 0 <= x < width and bits:
+            bits = bits << shift if shift >= 0 else bits >> -shift
+            index = page * width + x
+            while bits and index < len(buf):
+                buf[index] |= bits & 0xFF
+                bits >>= 8
+                index += width
+        x += 1
+
+
+def blit_text(buf, x, y, s, cache, width=128):
+    """OR the glyphs of s into an SSD1306 page buffer with the text origin at (x, y)"""
+    for char in s:
+        advance, left, top, columns = cache.get(char)
+        _blit_columns(buf, x + left, y + top, columns, width)
+        x += advance
+
+
+def blit_icon(buf, x, y, name, width=128):
+    """OR an 8x8 icon into an SSD1306 page buffer with its top left corner at (x, y)"""
+    _blit_columns(buf, x, y, _ICON_COLUMNS[name], width)
+
+
 class ChargingDisplay:
     """
     Display controller for the RFID charging station
     Shows charging status, session info, and system messages
     """
 
-    def __init__(self):
+    def __init__(self, debug=False):
+        # Render through PIL instead of the glyph cache (slower, for comparing output)
+        self.debug = debug
+
+        # Serializes panel writes and the shared PIL canvas across threads
+        self._lock = threading.Lock()
+
         # Initialize I2C and display
-        self.i2c = busio.I2C(board.SCL, board.SDA)
+        self.i2c = create_i2c_bus()
         self.display = SSD1306_I2C(128, 64, self.i2c)
 
+        # Write page ranges straight to the panel when the driver exposes the
+        # I2C device, otherwise go through the driver's own show()
+        self._burst = hasattr(self.display, "i2c_device") and self.display.pages * 8 == self.display.height
+        if self._burst:
+            # Horizontal addressing: the RAM pointer wraps into the next page,
+            # so a run of pages is one continuous data stream
+            self._write_command(0x20, 0x00)
+
+        # Last frame sent to the panel in SSD1306 page layout (cleared on init)
+        self._prev_buf = bytearray(self.display.width * self.display.height // 8)
+
+        # time.monotonic() of the last frame that reached the panel (or was already on it)
+        self.last_flush_ts = 0.0
+
+        # Reused canvas for the PIL debug path, cleared before each render
+        self._scratch_image = Image.new("1", (self.display.width, self.display.height))
+        self._scratch_draw = ImageDraw.Draw(self._scratch_image)
+
         # Load fonts
         try:
             self.font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 13)
@@ -26,34 +159,145 @@ class ChargingDisplay:
             self.font_small = ImageFont.load_default()
             self.font_tiny = ImageFont.load_default()
 
+        # Glyph caches per font (load_default may return the same font object)
+        self._glyph_caches = {}
+        for font in (self.font_large, self.font_small, self.font_tiny):
+            if font not in self._glyph_caches:
+                self._glyph_caches[font] = GlyphCache(font)
+
+        # Pre-render static screens once so redraws skip PIL rasterization
+        self._static_frames = {
+            "welcome": self._render_welcome(),
+            # Fixed station messages; other message texts are rendered per call
+            **{f"api_success:{m}": self._render_api_success(m) for m in ("Billing sent", "Billing processed")},
+            **{f"api_error:{m}": self._render_api_error(m)
+               for m in ("API Error", "Auth failed", "Billing failed", "Unknown card")},
+            # Indexed by blink phase: 0 shows "ACTIVE", 1 shows "CHARGING"
+            "charging_active": (
+                self._render_charging_active_background(0),
+                self._render_charging_active_background(1),
+            ),
+        }
+
         # Initialize display
         self.clear_display()
         self.show_welcome_message()
 
     def clear_display(self):
         """Clear the display"""
-        self.display.fill(0)
-        self.display.show()
+        self._show_buffer(bytes(len(self._prev_buf)), force=True)
+
+    def _render(self, *texts, base=None, icons=()):
+        """Render text into a new SSD1306 page buffer
 
-    def _create_image(self):
-        """Create a new image for drawing"""
-        return Image.new("1", (self.display.width, self.display.height))
+        Args:
+            texts: ((x, y), text, font) tuples
+            base: Page buffer to draw on top of (copied, not modified)
+            icons: ((x, y), icon_name) tuples, see ICONS
+        """
+        buf = bytearray(base) if base is not None else bytearray(len(self._prev_buf))
+
+        if self.debug:
+            # The scratch canvas is shared, see _show_buffer
+            with self._lock:
+                draw = self._scratch_draw
+                draw.rectangle((0, 0, self.display.width, self.display.height), fill=0)
+                for xy, text, font in texts:
+                    draw.text(xy, text, font=font, fill=255)
+                for xy, name in icons:
+                    self._scratch_image.paste(255, xy, Image.frombytes("1", (8, 8), ICONS[name]))
+                overlay = self._image_to_buffer(self._scratch_image)
+            for i, byte in enumerate(overlay):
+                buf[i] |= byte
+            return buf
+
+        width = self.display.width
+        for (x, y), text, font in texts:
+            blit_text(buf, x, y, text, self._glyph_caches[font], width)
+        for (x, y), name in icons:
+            blit_icon(buf, x, y, name, width)
+        return buf
+
+    def _image_to_buffer(self, image):
+        """Convert a 1-bit image to the SSD1306 page layout (8 vertical pixels per byte)"""
+        # After transposing, every packed row is one display column; LSB-first
+        # packing puts the top pixel of each 8-pixel page into bit 0
+        columns = image.transpose(Image.Transpose.TRANSPOSE).tobytes("raw", "1;R")
+        pages = self.display.height // 8
+        return b"".join(columns[page::pages] for page in range(pages))
+
+    def _show_buffer(self, buf, force=False):
+        """Send the pages of an SSD1306 page buffer that differ from the last frame
 
-    def _show_image(self, image):
-        """Display the image on the screen"""
-        self.display.image(image)
-        self.display.show()
+        Args:
+            buf: Page buffer with the size of the display
+            force: Send every page even if it did not change
+        """
+        # The display thread and shutdown may both draw; one frame at a time keeps
+        # _prev_buf in step with the panel and I2C transfers from interleaving
+        with self._lock:
+            # Same frame as last time (e.g. same blink phase and minute): nothing to send
+            if not force and buf == self._prev_buf:
+                self.last_flush_ts = time.monotonic()
+                return
+
+            if not self._burst:
+                self.display.buf[:] = buf
+                self.display.show()
+                self._prev_buf[:] = buf
+                self.last_flush_ts = time.monotonic()
+                return
+
+            # Coalesce changed pages into runs, each sent as one data transfer
+            width = self.display.width
+            run_start = None
+            for page in range(len(buf) // width + 1):
+                start = page * width
+                end = start + width
+                if end <= len(buf) and (force or buf[start:end] != self._prev_buf[start:end]):
+                    if run_start is None:
+                        run_start = page
+                elif run_start is not None:
+                    self._write_pages(run_start, page - 1, buf[run_start * width:start])
+                    run_start = None
+            self._prev_buf[:] = buf
+            self.last_flush_ts = time.monotonic()
+
+    def _write_command(self, *command):
+        """Send SSD1306 commands in a single I2C transfer"""
+        device = self.display.i2c_device
+        with device:
+            # Control byte 0x00: the rest of the transfer is a command stream
+            device.write(bytes((0x00, *command)))
+
+    def _write_pages(self, first_page, last_page, data):
+        """Write a run of pages (8 pixel rows each) to the display RAM"""
+        device = self.display.i2c_device
+        with device:
+            # Limit the RAM window to the pages being sent
+            device.write(bytes((0x00, 0x21, 0, self.display.width - 1, 0x22, first_page, last_page)))
+            # Control byte 0x40: data stream
+            device.write(b"\x40" + data)
+
+    def _cached_frame(self, key, render, *args):
+        """Return the pre-rendered frame for key, render uncached if there is none"""
+        # Not stored: keys with free-form text (e.g. error strings) would grow the cache without bound
+        frame = self._static_frames.get(key)
+        if frame is None:
+            frame = render(*args)
+        return frame
+
+    def _render_welcome(self):
+        """Render the static welcome screen"""
+        return self._render(
+            ((5, 10), "Mobile Charging", self.font_large),
+            ((15, 30), "Station Ready", self.font_small),
+            ((5, 50), "Present RFID card", self.font_tiny),
+        )
 
     def show_welcome_message(self):
         """Show welcome message when system starts"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
-
-        draw.text((5, 10), "Mobile Charging", font=self.font_large, fill=255)
-        draw.text((15, 30), "Station Ready", font=self.font_small, fill=255)
-        draw.text((5, 50), "Present RFID card", font=self.font_tiny, fill=255)
-
-        self._show_image(image)
+        self._show_buffer(self._static_frames["welcome"])
 
     def show_pricing_info(self, heading, start_time, end_time, amount, quantity_type="MINUTE"):
         """Show pricing information based on provided parameters
@@ -64,20 +308,8 @@ class ChargingDisplay:
             amount: Price amount (0.0 displays as FREE)
             quantity_type: Quantity type (e.g., "MINUTE", "SECOND", "HOUR")
         """
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
-
-        # Map quantity types to shorter versions
-        quantity_mapping = {
-            "MINUTE": "min",
-            "SECOND": "sec",
-            "HOUR": "hr",
-            "KILOWATT_HOUR": "kWh",
-            "UNIT": "unit"
-        }
-
         # Get short version, fallback to original if not found
-        short_quantity = quantity_mapping.get(quantity_type.upper(), quantity_type.lower())
+        short_quantity = _QTY_MAP.get(quantity_type.upper(), quantity_type.lower())
 
         # Determine price display text
         if amount == 0.0:
@@ -86,112 +318,116 @@ class ChargingDisplay:
             price_text = f"€{amount:.2f}/{short_quantity}"
 
         # Display pricing information with more space utilization
-        draw.text((15, 5), heading, font=self.font_small, fill=255)
-        draw.text((15, 25), price_text, font=self.font_large, fill=255)
-        
+        texts = [
+            ((15, 5), heading, self.font_small),
+            ((15, 25), price_text, self.font_large),
+        ]
+
         # Only display time period if both start_time and end_time are provided
         if start_time and end_time:
             time_period = f"{start_time}-{end_time}"
-            draw.text((10, 48), f"Active: {time_period}", font=self.font_small, fill=255)
-
-        self._show_image(image)
+            texts.append(((10, 48), f"Active: {time_period}", self.font_small))
 
-    def show_card_detected(self, tag_id):
-        """Show when RFID card is detected"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
+        self._show_buffer(self._render(*texts))
 
-        draw.text((20, 5), "Card Detected", font=self.font_small, fill=255)
-        draw.text((10, 25), f"ID: {str(tag_id)[:10]}", font=self.font_tiny, fill=255)
-        draw.text((25, 45), "Processing...", font=self.font_tiny, fill=255)
+    def show_card_detected(self, tag_id_short):
+        """Show when RFID card is detected
 
-        self._show_image(image)
-
-    def show_charging_started(self, tag_id, start_time):
-        """Show charging session started"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
+        Args:
+            tag_id_short: Tag ID as shown on the display (first 10 characters)
+        """
+        self._show_buffer(self._render(
+            ((20, 5), "Card Detected", self.font_small),
+            ((10, 25), f"ID: {tag_id_short}", self.font_tiny),
+            ((25, 45), "Processing...", self.font_tiny),
+        ))
 
-        draw.text((15, 0), "CHARGING", font=self.font_large, fill=255)
-        draw.text((30, 20), "ACTIVE", font=self.font_large, fill=255)
-        draw.text((5, 40), f"Started: {start_time.strftime('%H:%M')}", font=self.font_tiny, fill=255)
-        draw.text((5, 52), f"Card: {str(tag_id)[:8]}", font=self.font_tiny, fill=255)
+    def show_charging_started(self, tag_id_short, start_time):
+        """Show charging session started
 
-        self._show_image(image)
+        Args:
+            tag_id_short: Tag ID as shown on the display (only 8 characters fit)
+            start_time: Start of the charging session
+        """
+        self._show_buffer(self._render(
+            ((15, 0), "CHARGING", self.font_large),
+            ((30, 20), "ACTIVE", self.font_large),
+            ((5, 40), f"Started: {start_time.strftime('%H:%M')}", self.font_tiny),
+            ((5, 52), f"Card: {tag_id_short[:8]}", self.font_tiny),
+        ))
 
-    def show_charging_active(self, start_time, duration_minutes):
-        """Show ongoing charging session with duration"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
+    def _render_charging_active_background(self, blink_phase):
+        """Render the static parts of the active charging screen"""
+        footer = ((5, 50), "Present card to stop", self.font_tiny)
 
         # Blinking effect for active charging
-        if int(time.time()) % 2:
-            draw.text((25, 0), "CHARGING", font=self.font_small, fill=255)
-        else:
-            draw.text((35, 0), "⚡ ACTIVE ⚡", font=self.font_tiny, fill=255)
+        if blink_phase:
+            return self._render(((25, 0), "CHARGING", self.font_small), footer)
 
-        draw.text((5, 20), f"Duration: {duration_minutes:.1f}min", font=self.font_tiny, fill=255)
-        draw.text((5, 35), f"Started: {start_time.strftime('%H:%M')}", font=self.font_tiny, fill=255)
-        draw.text((5, 50), "Present card to stop", font=self.font_tiny, fill=255)
+        # Bolt icons sit on the baseline of the tiny font on both sides of "ACTIVE"
+        return self._render(((45, 0), "ACTIVE", self.font_tiny), footer,
+                            icons=(((35, 2), "bolt"), ((85, 2), "bolt")))
 
-        self._show_image(image)
+    def show_charging_active(self, start_time, duration_minutes):
+        """Show ongoing charging session with duration"""
+        # Only the duration and start time change between redraws
+        background = self._static_frames["charging_active"][int(time.time()) % 2]
+        self._show_buffer(self._render(
+            ((5, 20), f"Duration: {duration_minutes:.1f}min", self.font_tiny),
+            ((5, 35), f"Started: {start_time.strftime('%H:%M')}", self.font_tiny),
+            base=background,
+        ))
 
     def show_charging_stopped(self, duration_minutes, cost=None):
         """Show charging session completed"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
-
-        draw.text((10, 0), "CHARGING", font=self.font_small, fill=255)
-        draw.text((20, 18), "STOPPED", font=self.font_small, fill=255)
-        draw.text((5, 35), f"Duration: {duration_minutes:.1f}min", font=self.font_tiny, fill=255)
-
         if cost:
-            draw.text((5, 47), f"Cost: €{cost:.2f}", font=self.font_tiny, fill=255)
+            footer = f"Cost: €{cost:.2f}"
         else:
-            draw.text((5, 47), "Processing billing...", font=self.font_tiny, fill=255)
-
-        self._show_image(image)
+            footer = "Processing billing..."
+
+        self._show_buffer(self._render(
+            ((10, 0), "CHARGING", self.font_small),
+            ((20, 18), "STOPPED", self.font_small),
+            ((5, 35), f"Duration: {duration_minutes:.1f}min", self.font_tiny),
+            ((5, 47), footer, self.font_tiny),
+        ))
+
+    def _render_api_success(self, message):
+        """Render the API success screen for a message"""
+        return self._render(
+            ((49, 10), "SUCCESS", self.font_small),
+            ((10, 30), message, self.font_tiny),
+            ((15, 50), "Ready for next", self.font_tiny),
+            icons=(((37, 14), "check"),),
+        )
 
     def show_api_success(self, message="Billing sent"):
         """Show API operation success"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
-
-        draw.text((35, 10), "✓ SUCCESS", font=self.font_small, fill=255)
-        draw.text((10, 30), message, font=self.font_tiny, fill=255)
-        draw.text((15, 50), "Ready for next", font=self.font_tiny, fill=255)
-
-        self._show_image(image)
+        self._show_buffer(self._cached_frame(f"api_success:{message}", self._render_api_success, message))
+
+    def _render_api_error(self, error_message):
+        """Render the API error screen for a message"""
+        return self._render(
+            ((45, 5), "ERROR", self.font_small),
+            ((5, 25), error_message[:18], self.font_tiny),
+            ((5, 40), "Session saved", self.font_tiny),
+            ((5, 52), "locally", self.font_tiny),
+            icons=(((33, 9), "warn"),),
+        )
 
     def show_api_error(self, error_message="API Error"):
         """Show API operation error"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
-
-        draw.text((30, 5), "⚠ ERROR", font=self.font_small, fill=255)
-        draw.text((5, 25), error_message[:18], font=self.font_tiny, fill=255)
-        draw.text((5, 40), "Session saved", font=self.font_tiny, fill=255)
-        draw.text((5, 52), "locally", font=self.font_tiny, fill=255)
-
-        self._show_image(image)
+        self._show_buffer(self._cached_frame(f"api_error:{error_message}", self._render_api_error, error_message))
 
     def show_system_status(self, status_text):
         """Show general system status"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
-
-        draw.text((20, 20), "SYSTEM", font=self.font_small, fill=255)
-        draw.text((5, 40), status_text, font=self.font_tiny, fill=255)
-
-        self._show_image(image)
+        self._show_buffer(self._render(
+            ((20, 20), "SYSTEM", self.font_small),
+            ((5, 40), status_text, self.font_tiny),
+        ))
 
     def show_temporary_message(self, message, duration=3):
         """Show a temporary message and return to previous state"""
-        image = self._create_image()
-        draw = ImageDraw.Draw(image)
-
         # Center the message
-        draw.text((10, 25), message, font=self.font_small, fill=255)
-
-        self._show_image(image)
+        self._show_buffer(self._render(((10, 25), message, self.font_small)))
         time.sleep(duration)
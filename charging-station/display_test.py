@@ -7,16 +7,25 @@ It cycles through all the main screens automatically with delays so you can obse
 the complete user experience flow.
 
 Usage:
-    python display_test.py
+    python display_test.py [--debug] [--mock] [--cycles N]
 
-The test will continuously cycle through the happy path workflow.
+Pass --debug to render through PIL instead of the glyph cache.
+Pass --mock to run against a mocked ChargingDisplay without pauses (no hardware, CI).
+Set CHARGING_DEMO_FAST=1 to skip the pauses between screens (non-interactive runs).
+
+The test will continuously cycle through the happy path workflow,
+or stop after --cycles N cycles.
 Press Ctrl+C at any time to exit the test.
 """
 
+import argparse
+import asyncio
+import os
 import sys
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time as dt_time
 import traceback
+from unittest.mock import MagicMock
 
 # Import the display module
 try:
@@ -26,27 +35,79 @@ except ImportError as e:
     print("Make sure display.py is in the same directory as this test file.")
     sys.exit(1)
 
+# Night rate window (22:00-08:00)
+_NIGHT_START = dt_time(22, 0, 0)
+_NIGHT_END = dt_time(8, 0, 0)
+
+# Skip visual pauses, only wait until each frame reached the display
+DEMO_FAST = os.environ.get("CHARGING_DEMO_FAST") == "1"
+
 
 class DisplayTester:
     """
     Test class for demonstrating the happy path charging workflow
     """
 
-    def __init__(self):
+    def __init__(self, debug=False, mock=False, cycles=None):
+        """
+        Args:
+            debug: Render through PIL instead of the glyph cache
+            mock: Use a mocked display and skip all pauses
+            cycles: Number of workflow cycles to run, None = until Ctrl+C
+        """
         self.display = None
+        self.debug = debug
+        self.mock = mock
+        self.fast = DEMO_FAST or mock
+        self.cycles = cycles
         self.test_data = self._prepare_test_data()
 
     def _prepare_test_data(self):
         """Prepare realistic test data for display methods"""
         now = datetime.now()
+        tag_id = 123456789012
         return {
-            'tag_id': 123456789012,
+            'tag_id': tag_id,
+            'tag_id_short': str(tag_id)[:10],
             'start_time': now,
             'charging_duration': 25.5,  # 25.5 minutes
             'cost': 2.55,
         }
 
-    def show_happy_path_workflow(self):
+    async def _poll_for(self, predicate, timeout, interval=0.05):
+        """Wait until predicate() is true, at most timeout seconds
+
+        Returns:
+            bool: True if the predicate became true
+        """
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(interval, remaining))
+        return True
+
+    async def _hold(self, t0, seconds):
+        """Keep the frame drawn since t0 (time.monotonic()) visible until t0 + seconds
+
+        With CHARGING_DEMO_FAST=1 this returns as soon as the frame is on the display.
+        """
+        if not await self._poll_for(lambda: self.display.last_flush_ts >= t0, timeout=seconds):
+            print("⚠️  Display did not update in time")
+            return
+        if not self.fast:
+            remaining = t0 + seconds - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+
+    async def _show(self, seconds, show, *args):
+        """Draw a screen and keep it visible for the given time"""
+        t0 = time.monotonic()
+        show(*args)
+        await self._hold(t0, seconds)
+
+    async def show_happy_path_workflow(self):
         """Show the complete happy path charging workflow"""
         print("🔄 Starting Happy Path Charging Workflow Demo")
         print("Press Ctrl+C to exit at any time")
@@ -54,81 +115,67 @@ class DisplayTester:
 
         cycle_count = 1
 
-        try:
-            while True:
-                print(f"\n🔄 Workflow Cycle #{cycle_count}")
-
-                # 1. Welcome Screen
-                print("1️⃣  Welcome Screen (5s)")
-                self.display.show_welcome_message()
-                time.sleep(5)
-
-                # 3. Card Detected
-                print("3️⃣  Card Detected (3s)")
-                self.display.show_card_detected(self.test_data['tag_id'])
-                time.sleep(3)
-
-                # 2. Pricing Information
-                print("2️⃣  Pricing Information - Different Quantity Types (6s)")
-                # Example with day rate per minute
-                self.display.show_pricing_info("Day Rate", "08:00", "22:00", 0.1000, "MINUTE")
-                time.sleep(2)
-
-                # Example with pricing per second
-                print("2️⃣b Per Second Pricing (2s)")
-                self.display.show_pricing_info("Per Second", "06:00", "18:00", 0.0017, "SECOND")
-                time.sleep(2)
-
-                # Example with night rate (FREE)
-                print("2️⃣c Night Rate - FREE (2s)")
-                self.display.show_pricing_info("Night Rate", "22:00", "08:00", 0.0000, "MINUTE")
-                time.sleep(2)
-
-                # 4. Charging Started
-                print("4️⃣  Charging Started (4s)")
-                start_time = datetime.now()
-                self.display.show_charging_started(self.test_data['tag_id'], start_time)
-                time.sleep(4)
-
-                # 5. Active Charging (simulate 15 seconds of charging with blinking)
-                print("5️⃣  Active Charging - Blinking Animation (15s)")
-                for second in range(15):
-                    duration = (second + 1) * 1.7  # Simulate increasing duration
-                    self.display.show_charging_active(start_time, duration)
-                    time.sleep(1)
-
-                # 6. Charging Stopped (without cost first)
-                print("6️⃣  Charging Stopped - Processing (3s)")
-                self.display.show_charging_stopped(self.test_data['charging_duration'])
-                time.sleep(3)
-
-                # 7. Charging Stopped (with cost)
-                print("7️⃣  Charging Stopped - With Cost (4s)")
-                self.display.show_charging_stopped(
-                    self.test_data['charging_duration'],
-                    self.test_data['cost']
-                )
-                time.sleep(4)
-
-                # 8. API Success
-                print("8️⃣  Billing Success (3s)")
-                self.display.show_api_success("Billing processed")
-                time.sleep(3)
-
-                # 9. Back to Welcome (brief transition)
-                print("9️⃣  Back to Welcome (2s)")
-                self.display.show_welcome_message()
-                time.sleep(2)
-
-                cycle_count += 1
-                print(f"✅ Completed cycle #{cycle_count - 1}")
-                print("🔄 Starting next cycle in 3 seconds...")
-                time.sleep(3)
-
-        except KeyboardInterrupt:
-            print("\n\n⚠️  Demo stopped by user")
-            print("🧹 Returning to welcome screen...")
-            self.display.show_welcome_message()
+        while self.cycles is None or cycle_count <= self.cycles:
+            print(f"\n🔄 Workflow Cycle #{cycle_count}")
+
+            # 1. Welcome Screen
+            print("1️⃣  Welcome Screen (5s)")
+            await self._show(5, self.display.show_welcome_message)
+
+            # 3. Card Detected
+            print("3️⃣  Card Detected (3s)")
+            await self._show(3, self.display.show_card_detected, self.test_data['tag_id_short'])
+
+            # 2. Pricing Information
+            print("2️⃣  Pricing Information - Different Quantity Types (6s)")
+            # Example with day rate per minute
+            await self._show(2, self.display.show_pricing_info, "Day Rate", "08:00", "22:00", 0.1000, "MINUTE")
+
+            # Example with pricing per second
+            print("2️⃣b Per Second Pricing (2s)")
+            await self._show(2, self.display.show_pricing_info, "Per Second", "06:00", "18:00", 0.0017, "SECOND")
+
+            # Example with night rate (FREE)
+            print("2️⃣c Night Rate - FREE (2s)")
+            await self._show(2, self.display.show_pricing_info, "Night Rate", "22:00", "08:00", 0.0000, "MINUTE")
+
+            # 4. Charging Started
+            print("4️⃣  Charging Started (4s)")
+            start_time = datetime.now()
+            await self._show(4, self.display.show_charging_started, self.test_data['tag_id_short'], start_time)
+
+            # 5. Active Charging (simulate 15 seconds of charging with blinking)
+            print("5️⃣  Active Charging - Blinking Animation (15s)")
+            # One monotonic timer drives all ticks, so rendering time does not add up
+            t0 = time.monotonic()
+            for second in range(15):
+                duration = (second + 1) * 1.7  # Simulate increasing duration
+                tick = time.monotonic()
+                self.display.show_charging_active(start_time, duration)
+                await self._hold(tick, t0 + second + 1 - tick)
+
+            # 6. Charging Stopped (without cost first)
+            print("6️⃣  Charging Stopped - Processing (3s)")
+            await self._show(3, self.display.show_charging_stopped, self.test_data['charging_duration'])
+
+            # 7. Charging Stopped (with cost)
+            print("7️⃣  Charging Stopped - With Cost (4s)")
+            await self._show(4, self.display.show_charging_stopped,
+                             self.test_data['charging_duration'],
+                             self.test_data['cost'])
+
+            # 8. API Success
+            print("8️⃣  Billing Success (3s)")
+            await self._show(3, self.display.show_api_success, "Billing processed")
+
+            # 9. Back to Welcome (brief transition)
+            print("9️⃣  Back to Welcome (2s)")
+            await self._show(2, self.display.show_welcome_message)
+
+            cycle_count += 1
+            print(f"✅ Completed cycle #{cycle_count - 1}")
+            print("🔄 Starting next cycle in 3 seconds...")
+            await asyncio.sleep(0 if self.fast else 3)
 
     def run_demo(self):
         """Initialize display and run the happy path demo"""
@@ -141,14 +188,20 @@ class DisplayTester:
 
         try:
             print("\n🔧 Initializing display...")
-            self.display = ChargingDisplay()
-            time.sleep(2)
+            t0 = time.monotonic()
+            if self.mock:
+                self.display = MagicMock(spec=ChargingDisplay)
+                # Every frame counts as flushed right away
+                self.display.last_flush_ts = float("inf")
+            else:
+                self.display = ChargingDisplay(debug=self.debug)
+            if not self.fast:
+                time.sleep(max(0, t0 + 2 - time.monotonic()))
             print("✅ Display initialized successfully")
 
             # Show current pricing info
             current_time = datetime.now().time()
-            if current_time >= datetime.strptime("22:00:00", "%H:%M:%S").time() or \
-               current_time < datetime.strptime("08:00:00", "%H:%M:%S").time():
+            if current_time >= _NIGHT_START or current_time < _NIGHT_END:
                 pricing_info = "FREE (Night Rate: 22:00-08:00)"
             else:
                 pricing_info = "€0.10/min (Day Rate: 08:00-22:00)"
@@ -159,9 +212,16 @@ class DisplayTester:
             print(f"💵 Simulated cost: €{self.test_data['cost']:.2f}")
 
             print("\n🎬 Starting demo in 3 seconds...")
-            time.sleep(3)
+            if not self.fast:
+                time.sleep(3)
 
-            self.show_happy_path_workflow()
+            try:
+                asyncio.run(self.show_happy_path_workflow())
+            except KeyboardInterrupt:
+                print("\n\n⚠️  Demo stopped by user")
+
+            if self.mock:
+                print(f"\n🧪 {len(self.display.method_calls)} display calls made")
 
         except Exception as e:
             print(f"\n❌ Fatal error during demo: {e}")
@@ -178,8 +238,14 @@ class DisplayTester:
 
 def main():
     """Main function to run the display demo"""
+    parser = argparse.ArgumentParser(description="ChargingDisplay happy path demo")
+    parser.add_argument("--debug", action="store_true", help="render through PIL instead of the glyph cache")
+    parser.add_argument("--mock", action="store_true", help="use a mocked display and skip all pauses")
+    parser.add_argument("--cycles", type=int, default=None, help="stop after this many workflow cycles")
+    args = parser.parse_args()
+
     try:
-        tester = DisplayTester()
+        tester = DisplayTester(debug=args.debug, mock=args.mock, cycles=args.cycles)
         tester.run_demo()
     except Exception as e:
         print(f"Failed to start demo: {e}")
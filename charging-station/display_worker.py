@@ -0,0 +1,79 @@
+import queue
+import threading
+import time
+
+from cpu_affinity import pin_to_display_core
+
+# Queued in place of a screen to end the worker thread
+_STOP = object()
+
+
+class DisplayWorker:
+    """
+    Draws screens on a dedicated thread so callers never wait for the display
+
+    Screens are queued with the time they stay visible; the next queued screen
+    is drawn once that time is up. The card loop enqueues and moves on.
+    """
+
+    def __init__(self, display):
+        """
+        Args:
+            display: The ChargingDisplay to draw on
+        """
+        self.display = display
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="display", daemon=True)
+        self._thread.start()
+
+    def show(self, method, *args, hold=2.0, welcome=True):
+        """
+        Queue a screen
+
+        Args:
+            method: Name of the ChargingDisplay show_* method
+            *args: Arguments for the method
+            hold: Seconds the screen stays visible before the next one is drawn
+            welcome: Return to the welcome screen after hold if nothing else is queued
+        """
+        self._queue.put((method, args, hold, welcome))
+
+    def __getattr__(self, name):
+        # display.show_*(...) calls on the worker are queued without a hold, so
+        # it can be passed where a display is expected (e.g. the pricing sequence)
+        if name.startswith("show_"):
+            return lambda *args: self.show(name, *args, hold=0.0, welcome=False)
+        raise AttributeError(name)
+
+    def stop(self, timeout=None):
+        """
+        Draw the screens still queued and end the worker thread
+
+        Args:
+            timeout: Seconds to wait for the thread, None waits until it ends
+        """
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        # Only this thread writes to the panel, so only this thread gets the
+        # reserved core and the raised priority (the card loop stays unpinned)
+        pin_to_display_core()
+        item = self._queue.get()
+        while item is not _STOP:
+            method, args, hold, welcome = item
+            try:
+                getattr(self.display, method)(*args)
+            except Exception as e:
+                print(f"Warning: Display update {method} failed: {e}")
+            if hold:
+                time.sleep(hold)
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                if welcome:
+                    try:
+                        self.display.show_welcome_message()
+                    except Exception as e:
+                        print(f"Warning: Display update show_welcome_message failed: {e}")
+                item = self._queue.get()
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import aiohttp
+
+# Optional: faster JSON encoder (C extension)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Default timeout for all calls, callers may pass their own per request
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+_session = None
+_session_loop = None
+
+
+async def get_session():
+    """
+    Return the shared aiohttp session, created on first use.
+
+    Keeps TCP connections to the partner, PDF and Nitrobox hosts alive across calls.
+    A session is bound to the event loop it was created in, so a new one is
+    created if the running loop changed.
+
+    Returns:
+        aiohttp.ClientSession: Shared session for the running loop
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            # The OAuth endpoint and the Nitrobox API share one host, so token
+            # refreshes reuse the API connections; partner and PDF are on the LAN.
+            # Resolve each host once per 5 minutes instead of aiohttp's default 10 s.
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=60, ttl_dns_cache=300),
+            timeout=DEFAULT_TIMEOUT
+        )
+        _session_loop = loop
+    return _session
+
+
+def dumps_json(obj):
+    """
+    Encode a request body as JSON, pass the result as data= with a JSON content type
+
+    Args:
+        obj: JSON serializable payload
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+async def close_session():
+    """Close the shared session, call on shutdown from the loop that used it"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed and _session_loop is asyncio.get_running_loop():
+        await _session.close()
+    _session = None
+    _session_loop = None
@@ -0,0 +1,52 @@
+import board
+import busio
+
+# The SSD1306 handles fast-mode plus; 400 kHz is the standard fast mode
+I2C_FREQUENCY = 1000000
+I2C_FALLBACK_FREQUENCY = 400000
+
+# Bus clock the kernel driver was configured with (big-endian u32 from the device tree)
+I2C_CLOCK_FREQUENCY_PATH = "/sys/class/i2c-adapter/i2c-1/of_node/clock-frequency"
+
+
+def create_i2c_bus():
+    """
+    Create the I2C bus for the display at 1 MHz
+
+    Falls back to 400 kHz if the board rejects the faster clock.
+
+    Returns:
+        busio.I2C: The initialized bus
+    """
+    try:
+        i2c = busio.I2C(board.SCL, board.SDA, frequency=I2C_FREQUENCY)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Warning: I2C at {I2C_FREQUENCY} Hz not supported ({e}), using {I2C_FALLBACK_FREQUENCY} Hz")
+        i2c = busio.I2C(board.SCL, board.SDA, frequency=I2C_FALLBACK_FREQUENCY)
+
+    check_kernel_i2c_baudrate()
+    return i2c
+
+
+def check_kernel_i2c_baudrate():
+    """
+    Warn if the kernel I2C driver is clocked below I2C_FREQUENCY
+
+    On the Raspberry Pi the bus speed is fixed by the device tree, so the
+    frequency requested in create_i2c_bus() only takes effect with
+    dtparam=i2c_arm_baudrate=1000000 in /boot/config.txt (reboot required).
+
+    Returns:
+        int: The configured bus clock in Hz, None if it cannot be read
+    """
+    try:
+        with open(I2C_CLOCK_FREQUENCY_PATH, "rb") as f:
+            baudrate = int.from_bytes(f.read(4), "big")
+    except OSError:
+        return None
+
+    if baudrate < I2C_FREQUENCY:
+        print(f"Warning: I2C bus runs at {baudrate} Hz. Add "
+              f"'dtparam=i2c_arm_baudrate={I2C_FREQUENCY}' to /boot/config.txt "
+              f"and reboot for faster display updates")
+    return baudrate
@@ -1,20 +1,29 @@
-import sys
-import os
+import logging
+import time
 
-# Add both current and parent directories to sys.path to enable imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
+# Top-level modules of charging-station (the script directory is on sys.path)
+from request_bearer_token import fetch_bearer_token_async
+from request_get_contract import get_nitrobox_contract
 
-if current_dir not in sys.path:
-    sys.path.insert(0, current_dir)
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+logger = logging.getLogger(__name__)
 
-from request_bearer_token import fetch_bearer_token
-from request_get_contract import get_nitrobox_contract
+PARTNER_ID_PROPERTY = 'partner-id'
+COMMISSION_PROPERTY = 'partner-comission-percentage'
+PARTNER_PROPERTY_IDENTS = frozenset({PARTNER_ID_PROPERTY, COMMISSION_PROPERTY})
+
+# Contracts rarely change between charging_started and charging_finished
+CONTRACT_CACHE_TTL = 60
+
+# Customers without partner properties are skipped without any HTTP call for this long
+NOT_RELEVANT_TTL = 300
+
+# contract_id -> (expiry on the time.monotonic() clock, contract)
+_contract_cache = {}
+# contract_id -> expiry on the time.monotonic() clock
+_not_relevant = {}
 
 
-def get_contract_for_customer(customer_info):
+async def get_contract_for_customer(customer_info):
     """
     Retrieve contract details for a customer from Nitrobox API.
     
@@ -24,15 +33,22 @@ def get_contract_for_customer(customer_info):
     Returns:
         dict: Contract details if successful, None if failed
     """
+    cached = _contract_cache.get(customer_info.contract_id)
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+
     # Get bearer token for Nitrobox API calls
-    bearer_token = fetch_bearer_token()
+    bearer_token = await fetch_bearer_token_async()
     if not bearer_token:
-        print("ERROR: Could not obtain bearer token for contract retrieval")
+        logger.error("Could not obtain bearer token for contract retrieval")
         return None
     
     # Get contract details from Nitrobox
-    print(f"Getting contract details for customer contract ID: {customer_info.contract_id}")
-    return get_nitrobox_contract(bearer_token, customer_info)
+    logger.info("Getting contract details for customer contract ID: %s", customer_info.contract_id)
+    contract = await get_nitrobox_contract(bearer_token, customer_info)
+    if contract:
+        _contract_cache[customer_info.contract_id] = (time.monotonic() + CONTRACT_CACHE_TTL, contract)
+    return contract
 
 
 def extract_partner_properties(contract):
@@ -46,28 +62,23 @@ def extract_partner_properties(contract):
         tuple: (partner_id, commission_percentage) - None values if not found
     """
     if not contract or 'properties' not in contract:
-        print("WARNING: Contract has no properties array")
+        logger.warning("Contract has no properties array")
         return None, None
     
-    properties = contract['properties']
-    partner_id = None
-    commission_percentage = None
-    
-    for prop in properties:
-        property_ident = prop.get('propertyIdent')
-        property_value = prop.get('propertyValue')
-        
-        if property_ident == 'partner-id':
-            partner_id = property_value
-            print(f"Found partner-id: {partner_id}")
-        elif property_ident == 'partner-comission-percentage':
-            commission_percentage = property_value
-            print(f"Found partner-comission-percentage: {commission_percentage}")
+    # Only the partner properties are needed, skip the rest of the list
+    values = {
+        prop.get('propertyIdent'): prop.get('propertyValue')
+        for prop in contract['properties']
+        if prop.get('propertyIdent') in PARTNER_PROPERTY_IDENTS
+    }
+    partner_id = values.get(PARTNER_ID_PROPERTY)
+    commission_percentage = values.get(COMMISSION_PROPERTY)
+    logger.debug("Found partner-id: %s, partner-comission-percentage: %s", partner_id, commission_percentage)
     
     return partner_id, commission_percentage
 
 
-def get_partner_info_from_customer(customer_info):
+async def get_partner_info_from_customer(customer_info):
     """
     Complete workflow to get partner information from customer data.
     
@@ -77,18 +88,23 @@ def get_partner_info_from_customer(customer_info):
     Returns:
         tuple: (partner_id, commission_percentage) - None values if not found or error
     """
+    if time.monotonic() < _not_relevant.get(customer_info.contract_id, 0.0):
+        logger.info("Not relevant for partner.")
+        return None, None
+
     # Get contract details
-    contract = get_contract_for_customer(customer_info)
+    contract = await get_contract_for_customer(customer_info)
     
     if not contract:
-        print("WARNING: Could not retrieve contract")
+        logger.warning("Could not retrieve contract")
         return None, None
 
     # Extract partner properties from contract
     partner_id, commission_percentage = extract_partner_properties(contract)
     
     if not partner_id or not commission_percentage:
-        print("Not relevant for partner.")
+        logger.info("Not relevant for partner.")
+        _not_relevant[customer_info.contract_id] = time.monotonic() + NOT_RELEVANT_TTL
         return None, None
         
     return partner_id, commission_percentage 
\ No newline at end of file
@@ -0,0 +1,63 @@
+import logging
+
+from .helper_contract_operations import get_partner_info_from_customer
+from .request_inform_partner_charging import request_partner_article
+from .request_inform_partner_comission import request_partner_commission
+
+logger = logging.getLogger(__name__)
+
+
+async def _request_article(partner_id, commission_percentage):
+    return await request_partner_article(
+        partner=partner_id,
+        article="test_article",
+        amount="100",
+        currency="EUR",
+        type_="charging"
+    )
+
+
+async def _request_commission(partner_id, commission_percentage):
+    return await request_partner_commission(
+        partner=partner_id,
+        commission=commission_percentage,
+        amount="100",  # This might need to be extracted from charging session data
+        currency="EUR"
+    )
+
+
+# event_kind -> (log message, partner endpoint)
+_DISPATCH = {
+    "started": ("Trying to inform partner", _request_article),
+    "stopped": ("Trying to inform partner that charging stopped", _request_commission),
+}
+
+
+async def inform_partner_event(event_kind, event_name, *args, **kwargs):
+    """
+    Inform the partner about a charging event.
+    
+    Args:
+        event_kind: "started" (article endpoint) or "stopped" (commission endpoint)
+        event_name: Name of the emitted event
+        kwargs: Event data, must contain customer_info
+    """
+    message, request_partner = _DISPATCH[event_kind]
+    logger.info(message)
+    
+    # Extract customer_info from kwargs
+    customer_info = kwargs.get("customer_info")
+    if not customer_info:
+        logger.warning("No customer_info provided to inform_partner_event (%s)", event_kind)
+        return
+    
+    # Get partner information using helper function
+    partner_id, commission_percentage = await get_partner_info_from_customer(customer_info)
+    
+    if not partner_id or not commission_percentage:
+        # Already logged by get_partner_info_from_customer
+        return
+
+    result = await request_partner(partner_id, commission_percentage)
+    
+    logger.info("Partner %s request result: %s", event_kind, result)
@@ -1,10 +1,31 @@
-import requests
-import asyncio
+import logging
+from functools import lru_cache
+from urllib.parse import quote
+
+from http_session import get_session
+
+logger = logging.getLogger(__name__)
+
+PARTNER_BASE_URL = "http://192.168.179.29"
+_HEADERS = {"Content-Type": "application/json"}
+
+_COMMISSION_URL_TEMPLATE = PARTNER_BASE_URL + "/partner/{partner}/commission/{commission}/amount/{amount}/currency/{currency}"
+
+
+@lru_cache(maxsize=256)
+def _commission_url(partner, commission, amount, currency):
+    # Quote every segment so values containing '/', '?' or '#' stay in their path segment
+    return _COMMISSION_URL_TEMPLATE.format(
+        partner=quote(str(partner), safe=""),
+        commission=quote(str(commission), safe=""),
+        amount=quote(str(amount), safe=""),
+        currency=quote(str(currency), safe="")
+    )
 
 
 async def request_partner_commission(partner: str, commission: str, amount: str, currency: str):
     """
-    Make an async HTTP POST request to the partner commission endpoint using requests library.
+    Make an async HTTP POST request to the partner commission endpoint using the shared aiohttp session.
     
     Args:
         partner: Partner identifier
@@ -12,43 +33,25 @@ async def request_partner_commission(partner: str, commission: str, amount: str,
         amount: Amount value
         currency: Currency code
     """
-    url = f"http://192.168.179.29/partner/{partner}/commission/{commission}/amount/{amount}/currency/{currency}"
+    url = _commission_url(partner, commission, amount, currency)
     
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
-    def make_request():
-        """Synchronous function to be run in executor"""
-        try:
-            response = requests.post(url, headers=headers, timeout=30)
-            return {
-                "status": response.status_code,
-                "response": response.text,
-                "url": url
-            }
-        except Exception as e:
-            return {
-                "error": str(e),
+    try:
+        session = await get_session()
+        async with session.post(url, headers=_HEADERS) as response:
+            result = {
+                "status": response.status,
+                "response": await response.text(),
                 "url": url
             }
-    
-    try:
-        # Run the synchronous request in a thread pool
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, make_request)
         
-        print(f"Request sent to: {url}")
-        if "error" in result:
-            print(f"Error making request to {url}: {result['error']}")
-        else:
-            print(f"Response status: {result['status']}")
-            print(f"Response: {result['response']}")
+        logger.info("Request sent to: %s", url)
+        logger.info("Response status: %s", result['status'])
+        logger.debug("Response: %s", result['response'])
         
         return result
                 
     except Exception as e:
-        print(f"Error making request to {url}: {str(e)}")
+        logger.error("Error making request to %s: %s", url, e)
         return {
             "error": str(e),
             "url": url
@@ -1,6 +1,14 @@
-import requests
-import asyncio
 import json
+import logging
+
+import aiohttp
+
+from http_session import get_session
+
+logger = logging.getLogger(__name__)
+
+PDF_DOWNLOAD_URL = "http://192.168.179.32:8000/download"
+_HEADERS = {"Content-Type": "application/json"}
 
 
 async def request_pdf_download(customer_ident: str, wait_seconds: int = 120, poll_seconds: int = 5):
@@ -12,58 +20,41 @@ async def request_pdf_download(customer_ident: str, wait_seconds: int = 120, pol
         wait_seconds: How long to wait for new document (default: 120)
         poll_seconds: Polling interval in seconds (default: 5)
     """
-    url = "http://192.168.179.32:8000/download"
-    
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
     payload = {
         "customerIdent": customer_ident,
         "waitSeconds": wait_seconds,
         "pollSeconds": poll_seconds
     }
     
-    def make_request():
-        """Synchronous function to be run in executor"""
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            return {
-                "status": response.status_code,
-                "response": response.text,
-                "json_response": response.json() if response.headers.get('content-type') == 'application/json' else None,
-                "url": url,
-                "payload": payload
-            }
-        except Exception as e:
-            return {
-                "error": str(e),
-                "url": url,
-                "payload": payload
-            }
+    # The service holds the request open for up to wait_seconds, so allow for that
+    timeout = aiohttp.ClientTimeout(total=wait_seconds + 30)
     
     try:
-        # Run the synchronous request in a thread pool
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, make_request)
-        
-        print(f"PDF download request sent to: {url}")
-        print(f"Payload: {json.dumps(payload, indent=2)}")
+        session = await get_session()
+        async with session.post(PDF_DOWNLOAD_URL, headers=_HEADERS, json=payload, timeout=timeout) as response:
+            # Decode the body once; content_type has the parameters (e.g. charset) stripped
+            text = await response.text()
+            result = {
+                "status": response.status,
+                "response": text,
+                "json_response": json.loads(text) if response.content_type == 'application/json' else None,
+                "url": PDF_DOWNLOAD_URL,
+                "payload": payload
+            }
         
-        if "error" in result:
-            print(f"Error making PDF download request to {url}: {result['error']}")
-        else:
-            print(f"Response status: {result['status']}")
-            print(f"Response: {result['response']}")
-            if result.get('json_response'):
-                print(f"JSON Response: {json.dumps(result['json_response'], indent=2)}")
+        logger.info("PDF download request sent to: %s", PDF_DOWNLOAD_URL)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Compact JSON, only serialized when debugging
+            logger.debug("Payload: %s", json.dumps(payload, separators=(",", ":")))
+        logger.info("Response status: %s", result['status'])
+        logger.debug("Response: %s", result['response'])
         
         return result
                 
     except Exception as e:
-        print(f"Error making PDF download request to {url}: {str(e)}")
+        logger.error("Error making PDF download request to %s: %s", PDF_DOWNLOAD_URL, e)
         return {
             "error": str(e),
-            "url": url,
+            "url": PDF_DOWNLOAD_URL,
             "payload": payload
         } 
\ No newline at end of file
@@ -8,109 +8,218 @@ This module contains all functions related to:
 - Display functions for pricing information
 """
 
+import asyncio
+import logging
 import time
-from datetime import datetime
+from datetime import timedelta
+from functools import lru_cache
 
+# Optional: vectorized tiered cost for batches of sessions
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
-def get_current_time_based_pricing(pricing_rules):
+# Optional: compile the tiered cost loop with Numba
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# "HH:MM" for every minute of the day
+_HHMM = tuple(f"{h:02d}:{m:02d}" for h in range(24) for m in range(60))
+
+# Size of the pricing lookup caches, see _parse_rule, _tier_arrays and build_minute_table
+_RULES_CACHE_SIZE = 32
+
+# Last blocking fee shown per display:
+# id(display) -> (display, rules, (minute, fee_label, quantity_type), pricing_info_args)
+_last_blocking_fee = {}
+
+
+@lru_cache(maxsize=4 * _RULES_CACHE_SIZE)
+def _parse_rule(start, end, price_amount):
     """
-    Determine which pricing rule to display based on current time
+    Parse the "HH:MM:SS" boundaries of a pricing rule
     
-    Args:
-        pricing_rules: List of pricing rules with time periods
-        
     Returns:
-        tuple: (price_amount, start_time, end_time, period_name) or None if no match
+        tuple: (start_min, end_min, price_amount, start_disp, end_disp) with
+               minute-of-day values and "HH:MM" display strings
     """
+    start_hour, start_minute = map(int, start.split(":")[0:2])  # e.g., "08:00:00"
+    end_hour, end_minute = map(int, end.split(":")[0:2])        # e.g., "22:00:00"
+    
+    start_min = start_hour * 60 + start_minute
+    end_min = end_hour * 60 + end_minute
+    # Out-of-day values such as "24:00" are formatted as given
+    start_disp = _HHMM[start_min] if start_min < 1440 else f"{start_hour:02d}:{start_minute:02d}"
+    end_disp = _HHMM[end_min] if end_min < 1440 else f"{end_hour:02d}:{end_minute:02d}"
+    return (start_min, end_min, price_amount, start_disp, end_disp)
+
+
+def _normalized_rules(pricing_rules):
+    """
+    Return the pricing rules as a hashable tuple of
+    (start_min, end_min, price_amount, start_disp, end_disp)
     
-    current_time = datetime.now().time()
-    current_hour = current_time.hour
-    current_minute = current_time.minute
-    current_total_minutes = current_hour * 60 + current_minute
-    
-    for rule in pricing_rules:
-        time_period = rule["criteria"]["timePeriod"]
-        start_str = time_period["start"]  # e.g., "08:00:00"
-        end_str = time_period["end"]      # e.g., "22:00:00"
-        
-        # Parse start and end times
-        start_hour, start_minute = map(int, start_str.split(":")[0:2])
-        end_hour, end_minute = map(int, end_str.split(":")[0:2])
-        
-        start_total_minutes = start_hour * 60 + start_minute
-        end_total_minutes = end_hour * 60 + end_minute
-        
+    The tuple is built from the rule values, so caches keyed on it pick up
+    rules that were changed in place and hold no reference to the rules list.
+    """
+    return tuple(
+        _parse_rule(rule["criteria"]["timePeriod"]["start"], rule["criteria"]["timePeriod"]["end"],
+                    rule["price"]["amount"])
+        for rule in pricing_rules
+    )
+
+
+def _match_time_based_pricing(rules, current_total_minutes):
+    """Find the pricing for a minute of the day, see get_current_time_based_pricing"""
+    for start_total_minutes, end_total_minutes, price_amount, start_disp, end_disp in rules:
         # Check if current time falls within this period
         if start_total_minutes <= end_total_minutes:
             # Normal period (e.g., 08:00-22:00)
             if start_total_minutes <= current_total_minutes < end_total_minutes:
                 # Determine period name based on the actual time range and price
-                price_amount = rule["price"]["amount"]
-                if start_hour >= 6 and end_hour <= 22:
+                if start_total_minutes // 60 >= 6 and end_total_minutes // 60 <= 22:
                     period_name = "Daytime"
                 elif price_amount == 0.0:
                     period_name = "FREE"
                 else:
                     period_name = "Standard"
                 
-                return (
-                    price_amount,
-                    f"{start_hour:02d}:{start_minute:02d}",
-                    f"{end_hour:02d}:{end_minute:02d}",
-                    period_name
-                )
+                return (price_amount, start_disp, end_disp, period_name)
         else:
             # Overnight period (e.g., 22:00-08:00)
             if current_total_minutes >= start_total_minutes or current_total_minutes < end_total_minutes:
-                price_amount = rule["price"]["amount"]
                 period_name = "FREE" if price_amount == 0.0 else "Nighttime"
                 
-                return (
-                    price_amount,
-                    f"{start_hour:02d}:{start_minute:02d}",
-                    f"{end_hour:02d}:{end_minute:02d}",
-                    period_name
-                )
+                return (price_amount, start_disp, end_disp, period_name)
     
     return None
 
 
-def calculate_tiered_cost(total_units, price_tiers, plan_name):
+@lru_cache(maxsize=_RULES_CACHE_SIZE)
+def build_minute_table(rules):
     """
-    Calculate cost using tiered pricing structure
+    Resolve the pricing for every minute of the day
     
     Args:
-        total_units: Total number of units (seconds, minutes, etc.)
-        price_tiers: List of price tiers with quantity and price
-        plan_name: Name for logging purposes
+        rules: Normalized rules tuple from _normalized_rules
         
     Returns:
-        float: Total cost based on tiered pricing
+        tuple: 1440 entries indexed by hour * 60 + minute, each the
+               get_current_time_based_pricing result for that minute
+    """
+    return tuple(_match_time_based_pricing(rules, minute) for minute in range(24 * 60))
+
+
+def get_current_time_based_pricing(pricing_rules):
+    """
+    Determine which pricing rule to display based on current time
+    
+    The result only changes with the minute of the day, so it is looked up in a
+    per-minute table built once per set of rules.
+    
+    Args:
+        pricing_rules: List of pricing rules with time periods
         
-    Example:
-        price_tiers = [
-            {"quantity": 5.0, "price": 0.0, "type": "FLAT"},  # First 5 units free
-            {"quantity": 1.0, "price": 0.01, "type": "FLAT"}  # Each additional unit €0.01
-        ]
+    Returns:
+        tuple: (price_amount, start_time, end_time, period_name) or None if no match
+    """
+    
+    now = time.localtime()
+    current_total_minutes = now.tm_hour * 60 + now.tm_min
+    
+    return build_minute_table(_normalized_rules(pricing_rules))[current_total_minutes]
+
+
+# Money is calculated in integer micro-euros, converted to euros only for the result
+MICRO = 1_000_000
+
+
+def to_micro(amount):
+    """Convert a euro amount to integer micro-euros"""
+    return int(round(amount * MICRO))
+
+
+def _tiered_core(total_ticks, quantities, prices):
+    """
+    Sum the tiered cost: each tier covers up to its quantity, the last tier's
+    price applies to all units beyond the tiers
+    
+    All integers: ticks and tier quantities in ticks, prices in micro-euros per
+    unit. The result is micro-euros times ticks per unit.
+    """
+    total_cost = 0
+    remaining_ticks = total_ticks
+    n = len(quantities)
+    for i in range(n):
+        if remaining_ticks <= 0:
+            break
+        ticks_in_this_tier = min(remaining_ticks, quantities[i])
+        total_cost += ticks_in_this_tier * prices[i]
+        remaining_ticks -= ticks_in_this_tier
+        if i == n - 1 and remaining_ticks > 0:
+            total_cost += remaining_ticks * prices[i]
+    return total_cost
+
+
+if NUMBA_AVAILABLE:
+    # Compiled once and cached on disk, the signature skips type inference on first call.
+    # Contiguous arrays ([::1]) and indexes bounded by len() allow unchecked, vectorizable access.
+    _tiered_core = njit("int64(int64, int64[::1], int64[::1])", cache=True, boundscheck=False)(_tiered_core)
+
+
+def _tier_arrays(price_tiers, ticks_per_unit):
+    """
+    Tier quantities (ticks) and prices (micro-euros) in the layout _tiered_core
+    expects, cached per tier values
+    """
+    return _tier_arrays_for(tuple((tier["quantity"], tier["price"]) for tier in price_tiers), ticks_per_unit)
+
+
+@lru_cache(maxsize=_RULES_CACHE_SIZE)
+def _tier_arrays_for(tiers, ticks_per_unit):
+    """See _tier_arrays, tiers is a tuple of (quantity, price)"""
+    quantities = [int(round(quantity * ticks_per_unit)) for quantity, _ in tiers]
+    prices = [to_micro(price) for _, price in tiers]
+    if NUMBA_AVAILABLE:
+        quantities = np.asarray(quantities, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.int64)
+    return quantities, prices
+
+
+def calculate_tiered_cost_micro(total_ticks, price_tiers, ticks_per_unit=1):
+    """
+    Calculate the tiered cost exactly in integer micro-euros
+    
+    Args:
+        total_ticks: Whole number of ticks, e.g. seconds
+        price_tiers: List of price tiers with quantity and price per unit
+        ticks_per_unit: Ticks per pricing unit, e.g. 60 for seconds and MINUTE pricing
         
-        For 10 units:
-        - First 5 units: 5 × €0.0 = €0.00
-        - Next 5 units: 5 × €0.01 = €0.05
-        - Total: €0.05
+    Returns:
+        int: Cost in micro-euros, rounded half up once at the end
     """
     if not price_tiers:
-        return 0.0
+        return 0
     
-    total_cost = 0.0
+    cost_ticks = int(_tiered_core(int(total_ticks), *_tier_arrays(price_tiers, ticks_per_unit)))
+    return (cost_ticks + ticks_per_unit // 2) // ticks_per_unit
+
+
+def _tier_breakdown_lines(total_units, price_tiers):
+    """Lines showing how the units are split across the tiers (debug only)"""
+    lines = []
     remaining_units = total_units
     
-    print(f"🔢 Calculating tiered pricing for {plan_name}:")
-    print(f"   Total units to process: {total_units:.2f}")
-    
     for i, tier in enumerate(price_tiers):
         tier_quantity = tier["quantity"]
         tier_price = tier["price"]
-        tier_type = tier.get("type", "FLAT")
         
         if remaining_units <= 0:
             break
@@ -118,50 +227,231 @@ def calculate_tiered_cost(total_units, price_tiers, plan_name):
         # Calculate units to apply this tier pricing to
         units_in_this_tier = min(remaining_units, tier_quantity)
         tier_cost = units_in_this_tier * tier_price
-        
-        total_cost += tier_cost
         remaining_units -= units_in_this_tier
         
-        print(f"   Tier {i+1}: {units_in_this_tier:.2f} units × €{tier_price:.4f} = €{tier_cost:.4f}")
+        lines.append(f"   Tier {i + 1}: {units_in_this_tier:.2f} units × €{tier_price:.4f} = €{tier_cost:.4f}")
         
         # If this tier doesn't fully consume remaining units and it's the last tier,
         # apply the last tier's rate to all remaining units
         if i == len(price_tiers) - 1 and remaining_units > 0:
             additional_cost = remaining_units * tier_price
-            total_cost += additional_cost
-            print(f"   Remaining {remaining_units:.2f} units × €{tier_price:.4f} = €{additional_cost:.4f}")
+            lines.append(f"   Remaining {remaining_units:.2f} units × €{tier_price:.4f} = €{additional_cost:.4f}")
             break
     
-    print(f"   💰 Total tiered cost: €{total_cost:.4f}")
+    return lines
+
+
+def calculate_tiered_cost(total_units, price_tiers, plan_name):
+    """
+    Calculate cost using tiered pricing structure
+    
+    Args:
+        total_units: Total number of units (seconds, minutes, etc.)
+        price_tiers: List of price tiers with quantity and price
+        plan_name: Name for logging purposes
+        
+    Returns:
+        float: Total cost based on tiered pricing
+        
+    Example:
+        price_tiers = [
+            {"quantity": 5.0, "price": 0.0, "type": "FLAT"},  # First 5 units free
+            {"quantity": 1.0, "price": 0.01, "type": "FLAT"}  # Each additional unit €0.01
+        ]
+        
+        For 10 units:
+        - First 5 units: 5 × €0.0 = €0.00
+        - Next 5 units: 5 × €0.01 = €0.05
+        - Total: €0.05
+    """
+    if not price_tiers:
+        return 0.0
+    
+    # Resolve fractional units to 1/1000 unit
+    total_cost = calculate_tiered_cost_micro(round(total_units * 1000), price_tiers, 1000) / MICRO
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        # One record for the whole breakdown instead of one per tier
+        lines = [f"🔢 Calculating tiered pricing for {plan_name}:",
+                 f"   Total units to process: {total_units:.2f}"]
+        lines += _tier_breakdown_lines(total_units, price_tiers)
+        lines.append(f"   💰 Total tiered cost: €{total_cost:.4f}")
+        logger.debug("\n".join(lines))
     return total_cost
 
 
-def test_tiered_pricing():
+def calculate_tiered_cost_batch(total_units_arr, price_tiers):
+    """
+    Calculate the tiered cost for many sessions at once, e.g. for reports
+    
+    Same result as calculate_tiered_cost per session: units resolved to 1/1000
+    unit, integer micro-euros, rounded half up once at the end.
+    
+    Args:
+        total_units_arr: Unit totals, one per session (sequence, array or scalar)
+        price_tiers: List of price tiers with quantity and price
+        
+    Returns:
+        Costs per session in euros (numpy array of the input's shape if NumPy is
+        available, else list)
+    """
+    if not NUMPY_AVAILABLE:
+        return [calculate_tiered_cost_micro(round(units * 1000), price_tiers, 1000) / MICRO
+                for units in total_units_arr]
+    
+    units = np.asarray(total_units_arr, dtype=np.float64)
+    if not price_tiers:
+        return np.zeros_like(units)
+    
+    # Integer ticks of 1/1000 unit; rint rounds half to even like round()
+    ticks = np.rint(units.reshape(-1) * 1000).astype(np.int64)
+    quantities, prices = (np.asarray(values, dtype=np.int64) for values in _tier_arrays(price_tiers, 1000))
+    tier_ends = np.cumsum(quantities)
+    tier_starts = tier_ends - quantities
+    
+    # Ticks per session (rows) and tier (columns), then the last tier's overflow
+    ticks_in_tiers = np.clip(ticks[:, None] - tier_starts, 0, quantities)
+    cost_ticks = ticks_in_tiers @ prices + np.maximum(ticks - tier_ends[-1], 0) * prices[-1]
+    cost_micro = (cost_ticks + 500) // 1000
+    return (cost_micro / MICRO).reshape(units.shape)
+
+
+# Plan kinds, see classify_plan
+PLAN_UNKNOWN = 0
+PLAN_BLOCKING = 1  # Time-based pricing (blocking-time)
+PLAN_TIERED = 2    # Usage-based pricing (charging-time) with tiered pricing
+
+# Fee kinds, see classify_plan
+FEE_BLOCKING = "blocking"
+FEE_CHARGING = "charging"
+
+# Seconds per quantity unit
+_UNIT_SECONDS = {"SECOND": 1, "MINUTE": 60, "HOUR": 3600}
+
+_ONE_SECOND = timedelta(seconds=1)
+
+
+def classify_plan(plan_options):
+    """
+    Classify a plan option once and store the result on it
+    
+    Adds _kind (PLAN_BLOCKING, PLAN_TIERED or PLAN_UNKNOWN), _quantity_type,
+    _unit_div (seconds per quantity unit) and _fee_kind (FEE_BLOCKING,
+    FEE_CHARGING or None, from the option name). Classified plans are skipped.
+    
+    Args:
+        plan_options: The plan options as returned by Nitrobox
+        
+    Returns:
+        dict: The same plan options
+    """
+    if "_kind" in plan_options:
+        return plan_options
+    
+    if "pricingGroups" in plan_options:
+        kind, quantity_type = PLAN_BLOCKING, plan_options.get("quantityType", "MINUTE")
+    elif "priceTiers" in plan_options:
+        kind, quantity_type = PLAN_TIERED, plan_options.get("quantityType", "SECOND")
+    else:
+        kind, quantity_type = PLAN_UNKNOWN, None
+    
+    unit_div = 1
+    if quantity_type is not None:
+        unit_div = _UNIT_SECONDS.get(quantity_type.upper())
+        if unit_div is None:
+            logger.warning("⚠️  Unknown quantity type: %s, using seconds", quantity_type)
+            unit_div = 1
+    
+    option_name = f'{plan_options.get("optionName", "")} {plan_options.get("name", "")}'.lower()
+    if "block" in option_name:
+        fee_kind = FEE_BLOCKING
+    elif "charging" in option_name:
+        fee_kind = FEE_CHARGING
+    else:
+        fee_kind = None
+    
+    plan_options["_kind"] = kind
+    plan_options["_fee_kind"] = fee_kind
+    plan_options["_quantity_type"] = quantity_type
+    plan_options["_unit_div"] = unit_div
+    return plan_options
+
+
+def prepare_plan(plan_options):
     """
-    Test function to verify tiered pricing calculation works correctly
+    Classify a plan option and build its pricing tables, e.g. right after it was fetched
+    
+    The cost calculation at the end of the session then only indexes the
+    cached per-minute table or tier arrays.
+    
+    Args:
+        plan_options: The plan options as returned by Nitrobox
+        
+    Returns:
+        dict: The same plan options
     """
-    print("🧪 Testing tiered pricing calculation...")
+    kind = classify_plan(plan_options)["_kind"]
+    if kind == PLAN_BLOCKING and plan_options["pricingGroups"]:
+        build_minute_table(_normalized_rules(plan_options["pricingGroups"][0]["pricingRules"]))
+    elif kind == PLAN_TIERED and plan_options["priceTiers"]:
+        _tier_arrays(plan_options["priceTiers"], plan_options["_unit_div"])
+    return plan_options
+
+
+def _calculate_blocking_cost(start_time, end_time, plan_options, plan_name):
+    """Time-based pricing: the rate active at charging start applies to the whole session"""
+    pricing_rules = plan_options["pricingGroups"][0]["pricingRules"]
+    quantity_type = plan_options["_quantity_type"]
+    
+    # Find pricing rule active during charging start
+    temp_total_minutes = start_time.hour * 60 + start_time.minute
     
-    # Example from user: 5 seconds free, then €0.01 per second
-    example_tiers = [
-        {"quantity": 5.0, "price": 0.0, "type": "FLAT"},
-        {"quantity": 1.0, "price": 0.01, "type": "FLAT"}
-    ]
+    active_pricing = build_minute_table(_normalized_rules(pricing_rules))[temp_total_minutes]
+    price_per_unit = active_pricing[0] if active_pricing else 0.0
     
-    test_cases = [
-        (3.0, 0.0),    # 3 seconds = €0.00 (all in free tier)
-        (5.0, 0.0),    # 5 seconds = €0.00 (exactly free tier)
-        (7.0, 0.02),   # 7 seconds = €0.02 (5 free + 2×€0.01)
-        (10.0, 0.05),  # 10 seconds = €0.05 (5 free + 5×€0.01)
-        (15.0, 0.10)   # 15 seconds = €0.10 (5 free + 10×€0.01)
-    ]
+    # Whole seconds as billed, the unit conversion happens in the integer division below
+    duration_seconds = (end_time - start_time) // _ONE_SECOND
+    unit_div = plan_options["_unit_div"]
     
-    print("Expected vs Actual results:")
-    for units, expected in test_cases:
-        actual = calculate_tiered_cost(units, example_tiers, "Test")
-        status = "✅" if abs(actual - expected) < 0.001 else "❌"
-        print(f"{status} {units} units: Expected €{expected:.2f}, Got €{actual:.2f}")
-        print()
+    cost = (duration_seconds * to_micro(price_per_unit) + unit_div // 2) // unit_div / MICRO
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("💰 %s cost calculation: %.2f %s × €%.4f = €%.4f",
+                     plan_name, duration_seconds / unit_div, quantity_type.lower(), price_per_unit, cost)
+    
+    return cost
+
+
+def _calculate_tiered_plan_cost(start_time, end_time, plan_options, plan_name):
+    """Usage-based pricing: tiered cost over the session duration"""
+    quantity_type = plan_options["_quantity_type"]
+    
+    # Whole seconds, as reported in the usage sent to Nitrobox
+    duration_seconds = (end_time - start_time) // _ONE_SECOND
+    
+    # Calculate cost using tiered pricing
+    cost = calculate_tiered_cost_micro(duration_seconds, plan_options["priceTiers"],
+                                       plan_options["_unit_div"]) / MICRO
+    if logger.isEnabledFor(logging.DEBUG):
+        total_units = duration_seconds / plan_options["_unit_div"]
+        lines = [f"🔢 Calculating tiered pricing for {plan_name}:"]
+        lines += _tier_breakdown_lines(total_units, plan_options["priceTiers"])
+        lines.append(f"💰 {plan_name} tiered cost calculation: {total_units:.2f} {quantity_type.lower()}, cost €{cost:.4f}")
+        logger.debug("\n".join(lines))
+    
+    return cost
+
+
+def _calculate_unknown_plan_cost(start_time, end_time, plan_options, plan_name):
+    logger.warning("⚠️  Unknown plan structure for %s", plan_name)
+    return 0.0
+
+
+_COST_BY_KIND = {
+    PLAN_BLOCKING: _calculate_blocking_cost,
+    PLAN_TIERED: _calculate_tiered_plan_cost,
+    PLAN_UNKNOWN: _calculate_unknown_plan_cost,
+}
 
 
 def calculate_single_plan_cost(start_time, end_time, plan_options, plan_name):
@@ -179,91 +469,9 @@ def calculate_single_plan_cost(start_time, end_time, plan_options, plan_name):
     """
     if not plan_options:
         return 0.0
-        
-    # Handle different plan option structures
-    if "pricingGroups" in plan_options:
-        # Time-based pricing (blocking-time)
-        pricing_rules = plan_options["pricingGroups"][0]["pricingRules"]
-        quantity_type = plan_options.get("quantityType", "MINUTE")
-        
-        # Find pricing rule active during charging start
-        temp_time = start_time.time()
-        temp_total_minutes = temp_time.hour * 60 + temp_time.minute
-        
-        price_per_unit = 0.0
-        for rule in pricing_rules:
-            time_period = rule["criteria"]["timePeriod"]
-            start_str = time_period["start"]
-            end_str = time_period["end"]
-            
-            rule_start_hour, rule_start_minute = map(int, start_str.split(":")[0:2])
-            rule_end_hour, rule_end_minute = map(int, end_str.split(":")[0:2])
-            
-            rule_start_total_minutes = rule_start_hour * 60 + rule_start_minute
-            rule_end_total_minutes = rule_end_hour * 60 + rule_end_minute
-            
-            if rule_start_total_minutes <= rule_end_total_minutes:
-                # Normal period
-                if rule_start_total_minutes <= temp_total_minutes < rule_end_total_minutes:
-                    price_per_unit = rule["price"]["amount"]
-                    break
-            else:
-                # Overnight period
-                if temp_total_minutes >= rule_start_total_minutes or temp_total_minutes < rule_end_total_minutes:
-                    price_per_unit = rule["price"]["amount"]
-                    break
-                    
-    elif "priceTiers" in plan_options:
-        # Usage-based pricing (charging-time) with tiered pricing
-        price_tiers = plan_options["priceTiers"]
-        quantity_type = plan_options.get("quantityType", "SECOND")
-        
-        # Calculate duration in the appropriate units
-        duration_seconds = (end_time - start_time).total_seconds()
-        
-        if quantity_type.upper() == "SECOND":
-            total_units = duration_seconds
-        elif quantity_type.upper() == "MINUTE":
-            total_units = duration_seconds / 60
-        elif quantity_type.upper() == "HOUR":
-            total_units = duration_seconds / 3600
-        else:
-            print(f"⚠️  Unknown quantity type: {quantity_type}, using seconds")
-            total_units = duration_seconds
-        
-        # Calculate cost using tiered pricing
-        cost = calculate_tiered_cost(total_units, price_tiers, plan_name)
-        
-        print(f"💰 {plan_name} tiered cost calculation:")
-        print(f"   Total {quantity_type.lower()}: {total_units:.2f}")
-        print(f"   Cost: €{cost:.4f}")
-        
-        return cost
-    else:
-        print(f"⚠️  Unknown plan structure for {plan_name}")
-        return 0.0
-    
-    # Calculate duration based on quantity type for time-based pricing
-    duration_seconds = (end_time - start_time).total_seconds()
-    
-    if quantity_type.upper() == "SECOND":
-        duration_units = duration_seconds
-    elif quantity_type.upper() == "MINUTE":
-        duration_units = duration_seconds / 60
-    elif quantity_type.upper() == "HOUR":
-        duration_units = duration_seconds / 3600
-    else:
-        print(f"⚠️  Unknown quantity type: {quantity_type}, using seconds")
-        duration_units = duration_seconds
     
-    cost = duration_units * price_per_unit
-    
-    print(f"💰 {plan_name} cost calculation:")
-    print(f"   Duration: {duration_units:.2f} {quantity_type.lower()}")
-    print(f"   Rate: €{price_per_unit:.4f}/{quantity_type.lower()}")
-    print(f"   Cost: €{cost:.4f}")
-    
-    return cost
+    kind = classify_plan(plan_options)["_kind"]
+    return _COST_BY_KIND[kind](start_time, end_time, plan_options, plan_name)
 
 
 def calculate_total_charging_cost(start_time, end_time, all_plan_options):
@@ -282,11 +490,11 @@ def calculate_total_charging_cost(start_time, end_time, all_plan_options):
     charging_cost = 0.0
     
     for _, plan_options in all_plan_options:
-        option_name = plan_options.get("optionName", "").lower()
+        fee_kind = classify_plan(plan_options)["_fee_kind"]
         
-        if "blocking" in option_name or "blocking-time" in option_name:
+        if fee_kind == FEE_BLOCKING:
             blocking_cost = calculate_single_plan_cost(start_time, end_time, plan_options, "Blocking Fee")
-        elif "charging" in option_name or "charging-time" in option_name:
+        elif fee_kind == FEE_CHARGING:
             charging_cost = calculate_single_plan_cost(start_time, end_time, plan_options, "Charging Fee")
     
     total_cost = blocking_cost + charging_cost
@@ -301,14 +509,15 @@ def calculate_total_charging_cost(start_time, end_time, all_plan_options):
 
 def debug_pricing_periods(pricing_rules):
     """
-    Debug function to show all available pricing periods
+    Debug function to log all available pricing periods
     """
-    print("📋 Available pricing periods:")
+    lines = ["📋 Available pricing periods:"]
     for i, rule in enumerate(pricing_rules):
         time_period = rule["criteria"]["timePeriod"]
         price = rule["price"]["amount"]
         currency = rule["price"]["currency"]
-        print(f"   {i+1}. {time_period['start']}-{time_period['end']}: {currency}{price:.4f}")
+        lines.append(f"   {i+1}. {time_period['start']}-{time_period['end']}: {currency}{price:.4f}")
+    logger.debug("\n".join(lines))
 
 
 def display_charging_fee(plan_options, display, fee_label="Charging Fee"):
@@ -346,10 +555,12 @@ def display_charging_fee(plan_options, display, fee_label="Charging Fee"):
     return True
 
 
-def display_sequential_pricing(all_plan_options, display):
+async def display_sequential_pricing(all_plan_options, display):
     """
     Display blocking fee for 3 seconds, then charging costs
     
+    The 3 second pause awaits instead of blocking the thread.
+    
     Args:
         all_plan_options: List of all plan options
         display: The display object to show information on
@@ -359,18 +570,17 @@ def display_sequential_pricing(all_plan_options, display):
     
     # Find both blocking and charging options
     for option_ident, plan_options in all_plan_options:
-        option_name = plan_options.get("optionName", "").lower()
-        name = plan_options.get("name", "").lower()
+        classify_plan(plan_options)
         
         # Check if this is a blocking/time-based option
-        if any(keyword in option_name or keyword in name for keyword in ["block", "blocking"]):
-            if "pricingGroups" in plan_options:
+        if plan_options["_fee_kind"] == FEE_BLOCKING:
+            if plan_options["_kind"] == PLAN_BLOCKING:
                 blocking_fee_option = (option_ident, plan_options)
                 print(f"Found blocking fee option: {option_ident} ({plan_options.get('optionName', 'Unknown')})")
         
         # Check if this is a charging/usage-based option
-        elif any(keyword in option_name or keyword in name for keyword in ["charging"]):
-            if "priceTiers" in plan_options:
+        elif plan_options["_fee_kind"] == FEE_CHARGING:
+            if plan_options["_kind"] == PLAN_TIERED:
                 charging_fee_option = (option_ident, plan_options)
                 print(f"Found charging fee option: {option_ident} ({plan_options.get('optionName', 'Unknown')})")
     
@@ -380,7 +590,7 @@ def display_sequential_pricing(all_plan_options, display):
         print("📱 Displaying blocking fee for 3 seconds...")
         success = display_time_based_blocking_fee(plan_options, display)
         if success:
-            time.sleep(3)
+            await asyncio.sleep(3)
         else:
             print("Failed to display blocking fee")
     
@@ -416,12 +626,20 @@ def display_time_based_blocking_fee(plan_options, display, fee_label="Blocking F
     
     pricing_rules = plan_options["pricingGroups"][0]["pricingRules"]
     
-    # Debug: Show all available pricing periods
-    debug_pricing_periods(pricing_rules)
+    # Same rules within the same minute: the price cannot have changed, just redraw it
+    now = time.localtime()
+    current_total_minutes = now.tm_hour * 60 + now.tm_min
+    render_key = (current_total_minutes, fee_label, plan_options.get("quantityType"))
+    rules = _normalized_rules(pricing_rules)
+    last = _last_blocking_fee.get(id(display))
+    if last and last[0] is display and last[1] == rules and last[2] == render_key:
+        display.show_pricing_info(*last[3])
+        return True
     
-    # Show current time for comparison
-    current_time = datetime.now().time()
-    print(f"🕐 Current time: {current_time.strftime('%H:%M:%S')}")
+    if logger.isEnabledFor(logging.DEBUG):
+        # Show all available pricing periods and the current time for comparison
+        debug_pricing_periods(pricing_rules)
+        logger.debug("🕐 Current time: %s", time.strftime("%H:%M:%S", now))
     
     # Get the pricing for the current time
     current_pricing = get_current_time_based_pricing(pricing_rules)
@@ -435,7 +653,9 @@ def display_time_based_blocking_fee(plan_options, display, fee_label="Blocking F
         
         # Display using the exact price from the matching time period
         # Use only the fee label without period descriptors
-        display.show_pricing_info(fee_label, start_time, end_time, price_amount, quantity_type)
+        pricing_info_args = (fee_label, start_time, end_time, price_amount, quantity_type)
+        display.show_pricing_info(*pricing_info_args)
+        _last_blocking_fee[id(display)] = (display, rules, render_key, pricing_info_args)
         return True
     else:
         print("Current time does not match any pricing period")
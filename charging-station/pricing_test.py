@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Pricing Test for the tiered cost calculation
+
+Usage:
+    python pricing_test.py
+
+Exits with status 1 if any case does not match.
+"""
+
+import sys
+
+from pricing_calculator import (
+    MICRO,
+    calculate_tiered_cost,
+    calculate_tiered_cost_batch,
+    calculate_tiered_cost_micro
+)
+
+
+def test_tiered_pricing():
+    """
+    Test function to verify tiered pricing calculation works correctly
+
+    Raises AssertionError on the first case that does not match.
+    """
+    print("🧪 Testing tiered pricing calculation...")
+    
+    # Example from user: 5 seconds free, then €0.01 per second
+    example_tiers = [
+        {"quantity": 5.0, "price": 0.0, "type": "FLAT"},
+        {"quantity": 1.0, "price": 0.01, "type": "FLAT"}
+    ]
+    
+    # Expected costs in micro-euros
+    test_cases = [
+        (3, 0),        # 3 seconds = €0.00 (all in free tier)
+        (5, 0),        # 5 seconds = €0.00 (exactly free tier)
+        (7, 20000),    # 7 seconds = €0.02 (5 free + 2×€0.01)
+        (10, 50000),   # 10 seconds = €0.05 (5 free + 5×€0.01)
+        (15, 100000)   # 15 seconds = €0.10 (5 free + 10×€0.01)
+    ]
+    
+    print("Expected vs Actual results:")
+    for units, expected in test_cases:
+        actual = calculate_tiered_cost_micro(units, example_tiers)
+        status = "✅" if actual == expected else "❌"
+        print(f"{status} {units} units: Expected €{expected / MICRO:.2f}, Got €{actual / MICRO:.2f}")
+        print()
+        assert actual == expected, units
+
+
+def test_batch_matches_scalar():
+    """
+    Test that the batch calculation gives the same cost as the per-session one
+
+    Raises AssertionError on the first session that does not match.
+    """
+    print("🧪 Testing batch against per-session pricing...")
+
+    tiers = [
+        {"quantity": 5.0, "price": 0.0, "type": "FLAT"},
+        {"quantity": 2.5, "price": 0.0017, "type": "FLAT"},
+        {"quantity": 1.0, "price": 0.01, "type": "FLAT"}
+    ]
+    # Fractional units exercise the 1/1000 unit resolution and the final rounding
+    sessions = [0, 3, 5, 5.0005, 6.25, 7.5, 10, 12.3456, 1000.5]
+
+    batch = list(calculate_tiered_cost_batch(sessions, tiers))
+    for units, cost in zip(sessions, batch):
+        assert cost == calculate_tiered_cost(units, tiers, "batch test"), units
+    print(f"✅ {len(sessions)} sessions match")
+
+
+if __name__ == "__main__":
+    try:
+        test_tiered_pricing()
+        test_batch_matches_scalar()
+    except AssertionError as e:
+        print(f"❌ Mismatch for {e} units")
+        sys.exit(1)
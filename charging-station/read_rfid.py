@@ -1,33 +1,50 @@
 # file: rfid_read_simple.py
 import RPi.GPIO as GPIO
+import logging
 import time
 import os
 import sys
 import asyncio
+import threading
 from datetime import datetime
 from mfrc522 import SimpleMFRC522
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from gpiozero import Button
 
+# Optional: faster libuv based event loop (Linux only)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from display import ChargingDisplay
+from display_worker import DisplayWorker
 from request_billing_run import create_nitrobox_billing_run
 from request_create_usage import create_nitrobox_usage
-from request_bearer_token import fetch_bearer_token
+from request_bearer_token import fetch_bearer_token_async
 from request_get_plan_options import get_nitrobox_plan_options
-from request_get_contract_details import get_option_idents_from_contract
+from request_get_contract_details import get_option_idents_from_contract, invalidate_option_idents
 from rfid_mapping import get_customer_info
 from async_event_emitter import AsyncEventEmitter
+from card_loop import TagState, rfid_producer, run_card_loop
 from partner.inform_partner_charging_started import inform_partner_charging_started
 from partner.inform_partner_charging_stopped import inform_partner
+from http_session import close_session
 from pdf.inform_pdf_service import inform_pdf_service
 from pricing_calculator import (
     calculate_total_charging_cost,
+    prepare_plan,
     display_sequential_pricing
 )
 
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    format="%(asctime)s %(levelname)s %(name)s - %(message)s"
+)
+
 # Global variable to count button releases
 button_release_count = 0
 
@@ -57,6 +74,7 @@ charging_session_start = None
 current_charging_rate = None  # Store the current pricing rate per minute
 current_plan_options = None  # Store the plan options for cost calculation
 all_stored_plan_options = []  # Store all plan options for total cost calculation
+pricing_display = None  # Running blocking fee -> charging fee sequence on the display
 
 # Setup for LED
 RELAY_PIN = 17
@@ -70,62 +88,70 @@ except Exception as e:
     print(f"Warning: Could not initialize display: {e}")
     display = None
 
-# Debounce variables
-last_tag_id = None
-last_read_time = 0
-DEBOUNCE_TIME = 2.0  # 2 seconds cooldown between reads of the same tag
+# Screens are drawn and held on the display thread, the card loop only enqueues them
+display_worker = DisplayWorker(display) if display else None
+
+# Debounce state of the card loop
+tag_state = TagState()
+
+# Parallel plan option requests per charging start
+PLAN_OPTION_CONCURRENCY = 5
+
+# Pause between polls while no card is in the field. SimpleMFRC522.read() polls
+# the reader back to back over SPI, which keeps a core busy between taps.
+RFID_POLL_INTERVAL = 0.05  # seconds
+
+# Back off when reads keep failing (e.g. SPI errors) instead of spinning on the reader
+READ_ERROR_WINDOW = 1.0  # seconds
+READ_ERROR_LIMIT = 5  # errors per window before backing off
+READ_ERROR_BACKOFF = 0.25  # seconds
+read_error_window_start = 0.0
+read_error_count = 0
 
 def read_rfid():
     """
     Read the RFID card and return the tag ID and text
+
+    Blocks until a card is presented, polling every RFID_POLL_INTERVAL seconds.
     """
+    global read_error_window_start, read_error_count
+
     try:
-        tag_id, text = reader.read()
+        tag_id, text = reader.read_no_block()
+        while not tag_id:
+            time.sleep(RFID_POLL_INTERVAL)
+            tag_id, text = reader.read_no_block()
         return tag_id, text
 
-    except:
-        # Return None if no tag is detected or read fails
+    except (OSError, RuntimeError, TimeoutError) as e:
+        # Return None if the read fails
+        now = time.monotonic()
+        if now - read_error_window_start >= READ_ERROR_WINDOW:
+            read_error_window_start = now
+            read_error_count = 0
+        read_error_count += 1
+        if read_error_count == READ_ERROR_LIMIT:
+            print(f"Warning: RFID reads failing repeatedly, backing off: {e}")
+        if read_error_count >= READ_ERROR_LIMIT:
+            time.sleep(READ_ERROR_BACKOFF)
         return None, None
 
-def get_bearer_token_with_error_handling():
+async def get_bearer_token_with_error_handling():
     """
     Fetch bearer token with standardized error handling for charging station
     Returns bearer token or None, handles display updates
     """
-    bearer_token = fetch_bearer_token()
+    bearer_token = await fetch_bearer_token_async()
     if not bearer_token:
         print("Failed to get bearer token")
-        if display:
-            display.show_api_error("Auth failed")
-            time.sleep(2)
-            display.show_welcome_message()
+        if display_worker:
+            display_worker.show("show_api_error", "Auth failed")
     return bearer_token
 
 
 
-def should_process_tag(tag_id):
-    """
-    Check if we should process this tag based on debounce logic
-    """
-    global last_tag_id, last_read_time
-
-    if tag_id is None:
-        return False
-
-    current_time = time.time()
-
-    # If it's a different tag, always process it
-    if tag_id != last_tag_id:
-        return True
-
-    # If it's the same tag, only process if enough time has passed
-    if current_time - last_read_time >= DEBOUNCE_TIME:
-        return True
-
-    return False
-
-def set_charging_state(customer_info):
-    global charging_active, charging_session_start, current_plan_options, all_stored_plan_options, button_release_count
+async def set_charging_state(customer_info):
+    global charging_active, charging_session_start, current_plan_options, all_stored_plan_options, button_release_count, pricing_display
     
     if charging_active:
         # Ending charging session
@@ -135,15 +161,15 @@ def set_charging_state(customer_info):
         # Emit charging_finished event to inform partner
         try:
             if 'event_emitter' in globals():
-                asyncio.run(event_emitter.emit("charging_finished",
-                                              tag_id=last_tag_id,
-                                              duration_minutes=(charging_end_time - charging_session_start).total_seconds() / 60,
-                                              customer_info=customer_info))
+                await event_emitter.emit("charging_finished",
+                                         tag_id=tag_state.last_tag_id,
+                                         duration_minutes=(charging_end_time - charging_session_start).total_seconds() / 60,
+                                         customer_info=customer_info)
         except Exception as e:
             print(f"Warning: Failed to emit charging_finished event: {e}")
 
         # Calculate cost and show summary
-        if display and charging_session_start:
+        if display_worker and charging_session_start:
             duration_minutes = (charging_end_time - charging_session_start).total_seconds() / 60
             
             # Calculate total cost from both blocking-time and charging-time plan options
@@ -153,8 +179,7 @@ def set_charging_state(customer_info):
                 print("⚠️  No plan options available, cannot calculate accurate cost")
                 cost = 0.0
                 
-            display.show_charging_stopped(duration_minutes, cost)
-            time.sleep(2)
+            display_worker.show("show_charging_stopped", duration_minutes, cost, welcome=False)
 
         # Create usage record in Nitrobox if we have a valid session
         if charging_session_start:
@@ -162,7 +187,7 @@ def set_charging_state(customer_info):
             print(f"Charging session ended. Duration: {duration_minutes:.2f} minutes")
 
             # Fetch bearer token first
-            bearer_token = get_bearer_token_with_error_handling()
+            bearer_token = await get_bearer_token_with_error_handling()
             if not bearer_token:
                 charging_active = False
                 charging_session_start = None
@@ -172,8 +197,8 @@ def set_charging_state(customer_info):
 
         
             # Create usage record in Nitrobox
-            success = create_nitrobox_usage(
-                tag_id=last_tag_id,
+            success = await create_nitrobox_usage(
+                tag_id=tag_state.last_tag_id,
                 charging_start_time=charging_session_start,
                 charging_end_time=charging_end_time,
                 bearer_token=bearer_token,
@@ -183,16 +208,13 @@ def set_charging_state(customer_info):
             
             if success:
                 print("Usage record successfully sent to Nitrobox")
-                if display:
-                    display.show_api_success("Billing processed")
-                    time.sleep(2)
-                    display.show_welcome_message()
+                if display_worker:
+                    display_worker.show("show_api_success", "Billing processed")
 
-                
-                
-                # Additional usage record specifically for button release tracking
-                button_success = create_nitrobox_usage(
-                    tag_id=last_tag_id,
+                # Additional usage record specifically for button release tracking,
+                # only billed once the charging usage itself was recorded
+                button_success = await create_nitrobox_usage(
+                    tag_id=tag_state.last_tag_id,
                     charging_start_time=charging_session_start,
                     charging_end_time=charging_end_time,
                     bearer_token=bearer_token,
@@ -206,19 +228,13 @@ def set_charging_state(customer_info):
                 else:
                     print("⚠️  Button release usage record failed")
 
-                # After successful usage creation, trigger billing run
-                billing_success = create_nitrobox_billing_run(bearer_token, customer_info)
-                if billing_success:
-                    print("✅ Billing run also successfully created")
-                else:
-                    print("⚠️  Usage record created but billing run failed")
+                # After successful usage creation, trigger billing run (in the background)
+                await event_emitter.emit("usage_recorded", bearer_token=bearer_token, customer_info=customer_info)
                     
             else:
                 print("Failed to send usage record to Nitrobox")
-                if display:
-                    display.show_api_error("Billing failed")
-                    time.sleep(2)
-                    display.show_welcome_message()
+                if display_worker:
+                    display_worker.show("show_api_error", "Billing failed")
 
         charging_active = False
         charging_session_start = None
@@ -233,57 +249,66 @@ def set_charging_state(customer_info):
         charging_active = True
 
         
-        # Emit charging_started event to inform partner
-        try:
-            if 'event_emitter' in globals():
-                asyncio.run(event_emitter.emit("charging_started",
-                                              tag_id=last_tag_id,
-                                              customer_info=customer_info))
-        except Exception as e:
-            print(f"Warning: Failed to emit charging_started event: {e}")
-
-        # get plan options and display current pricing
-        bearer_token = get_bearer_token_with_error_handling()
+        async def emit_charging_started():
+            # Emit charging_started event to inform partner
+            try:
+                if 'event_emitter' in globals():
+                    await event_emitter.emit("charging_started",
+                                             tag_id=tag_state.last_tag_id,
+                                             customer_info=customer_info)
+            except Exception as e:
+                print(f"Warning: Failed to emit charging_started event: {e}")
+
+        # get plan options and display current pricing; the token does not depend on
+        # the charging_started listeners, so both run at the same time
+        _, bearer_token = await asyncio.gather(emit_charging_started(), get_bearer_token_with_error_handling())
         if bearer_token and customer_info:
             # Get option identifiers from contract details using customer's contract
-            option_idents = get_option_idents_from_contract(customer_info.contract_ident, bearer_token)
+            option_idents = await get_option_idents_from_contract(customer_info.contract_ident, bearer_token)
             
             # Get all plan options in parallel
             if option_idents:
-                def get_single_plan_option(option_ident):
+                # At most PLAN_OPTION_CONCURRENCY requests in flight at once
+                plan_option_slots = asyncio.Semaphore(PLAN_OPTION_CONCURRENCY)
+
+                async def get_single_plan_option(option_ident):
                     """Helper function to get plan options for a single identifier"""
-                    return option_ident, get_nitrobox_plan_options(option_ident, bearer_token)
+                    async with plan_option_slots:
+                        plan_options = await get_nitrobox_plan_options(option_ident, bearer_token)
+                    if plan_options:
+                        # Classify and build the pricing tables now, not when charging stops
+                        prepare_plan(plan_options)
+                    return option_ident, plan_options
                 
                 all_plan_options = []
                 
-                # Get all plan options in parallel using ThreadPoolExecutor
-                with ThreadPoolExecutor(max_workers=min(len(option_idents), 5)) as executor:
-                    # Submit all requests
-                    future_to_ident = {
-                        executor.submit(get_single_plan_option, option_ident): option_ident 
-                        for option_ident in option_idents
-                    }
-                    
-                    # Collect results as they complete
-                    for future in as_completed(future_to_ident):
-                        try:
-                            option_ident, plan_options = future.result()
-                            if plan_options:
-                                all_plan_options.append((option_ident, plan_options))
-                                print(f"✅ Successfully retrieved plan options for {option_ident}")
-                            else:
-                                print(f"❌ Failed to retrieve plan options for {option_ident}")
-                        except Exception as e:
-                            option_ident = future_to_ident[future]
-                            print(f"❌ Exception retrieving plan options for {option_ident}: {e}")
+                # Requests overlap on the shared HTTP session
+                results = await asyncio.gather(
+                    *(get_single_plan_option(option_ident) for option_ident in option_idents),
+                    return_exceptions=True
+                )
+                
+                for option_ident, result in zip(option_idents, results):
+                    if isinstance(result, Exception):
+                        print(f"❌ Exception retrieving plan options for {option_ident}: {result}")
+                    elif result[1]:
+                        all_plan_options.append(result)
+                        print(f"✅ Successfully retrieved plan options for {option_ident}")
+                    else:
+                        print(f"❌ Failed to retrieve plan options for {option_ident}")
+                
+                if len(all_plan_options) < len(option_idents):
+                    # The cached option idents may be outdated (e.g. an option was removed
+                    # from the contract), look them up again on the next tap
+                    invalidate_option_idents(customer_info.contract_ident)
                 
                 # Store all plan options globally for total cost calculation
                 all_stored_plan_options = all_plan_options.copy()
                 print(f"📝 Stored {len(all_stored_plan_options)} plan options for cost calculation")
 
-                # Display blocking fee for 3 seconds, then charging costs
-                if all_plan_options and display:
-                    display_sequential_pricing(all_plan_options, display)
+                # Display blocking fee for 3 seconds, then charging costs (runs alongside the main loop)
+                if all_plan_options and display_worker:
+                    pricing_display = asyncio.create_task(display_sequential_pricing(all_plan_options, display_worker))
 
 async def toggle_relay_listener(event_name, **kwargs):
     """
@@ -300,57 +325,90 @@ async def toggle_relay_listener(event_name, **kwargs):
     
     # kwargs may contain tag_id, customer_info, duration_minutes etc. but not needed for relay control
 
-try:
+async def billing_run_listener(event_name, bearer_token, customer_info, **kwargs):
+    """
+    Async event listener to create the billing run once the usage records exist
+    """
+    billing_success = await create_nitrobox_billing_run(bearer_token, customer_info)
+    if billing_success:
+        print("✅ Billing run also successfully created")
+    else:
+        print("⚠️  Usage record created but billing run failed")
+
+async def handle_tag(tag_id, text):
+    """
+    Handle one card tap: show it, look up the customer and toggle charging
+    """
+    print(f"Tag ID: {tag_id}")
+    tag_id_str = str(tag_id)
+    tag_id_short = tag_id_str[:10]
+
+    # Show card detected on display
+    if display_worker:
+        if pricing_display:
+            # A new card takes over the display from the pricing sequence
+            pricing_display.cancel()
+        # Brief pause to show card detection (on the display thread)
+        display_worker.show("show_card_detected", tag_id_short, hold=1.0, welcome=False)
+
+    if text:
+        print(f"Text: {text.strip()}")
+    else:
+        print("No text data on tag.")
+
+    # Get customer information for this RFID tag
+    customer_info = get_customer_info(tag_id_str)
+    if not customer_info:
+        print(f"WARNING: No customer information found for RFID tag {tag_id}")
+        if display_worker:
+            display_worker.show("show_api_error", "Unknown card")
+        return  # Skip processing if no customer info found
+
+    await set_charging_state(customer_info)
+    print("-" * 30)  # Add separator between reads
     print("Hold a tag near the reader...")
 
-    # Set up event emitter and register partner notification
+async def main():
     global event_emitter
+
+    print("Hold a tag near the reader...")
+
+    # Set up event emitter and register partner notification
     event_emitter = AsyncEventEmitter()
-    event_emitter.on("charging_started", inform_partner_charging_started)
-    event_emitter.on("charging_finished", inform_partner)
-    event_emitter.on("charging_finished", inform_pdf_service)
+    # Partner and PDF notifications are side-band work, emit does not wait for them
+    event_emitter.on_background("charging_started", inform_partner_charging_started)
+    event_emitter.on_background("charging_finished", inform_partner)
+    event_emitter.on_background("charging_finished", inform_pdf_service)
+    # The billing run is not shown on the display, the card loop does not wait for it
+    event_emitter.on_background("usage_recorded", billing_run_listener)
     # Register async relay control listener
     event_emitter.on("charging_started", toggle_relay_listener)
     event_emitter.on("charging_finished", toggle_relay_listener)
+    event_emitter.freeze()
 
-    while True:
-        tag_id, text = read_rfid()
-        
-        if should_process_tag(tag_id):
-            print(f"Tag ID: {tag_id}")
-
-            # Show card detected on display
-            if display:
-                display.show_card_detected(tag_id)
-                time.sleep(1)  # Brief pause to show card detection
+    # The reader thread puts card reads, the card loop consumes them
+    events = asyncio.Queue(maxsize=1)
+    threading.Thread(target=rfid_producer, args=(asyncio.get_running_loop(), events, read_rfid),
+                     name="rfid-read", daemon=True).start()
 
-            if text:
-                print(f"Text: {text.strip()}")
-            else:
-                print("No text data on tag.")
-
-            # Update tracking variables
-            last_tag_id = tag_id
-            last_read_time = time.time()
-
-            # Get customer information for this RFID tag
-            customer_info = get_customer_info(str(tag_id))
-            if not customer_info:
-                print(f"WARNING: No customer information found for RFID tag {tag_id}")
-                if display:
-                    display.show_api_error("Unknown card")
-                    time.sleep(2)
-                    display.show_welcome_message()
-                continue  # Skip processing if no customer info found
-            
-            set_charging_state(customer_info)
-            print("-" * 30)  # Add separator between reads
-            print("Hold a tag near the reader...")
+    try:
+        await run_card_loop(events, tag_state, handle_tag)
+
+    finally:
+        GPIO.cleanup()
+        if display_worker:
+            # Let the queued screens finish before the display is cleared
+            display_worker.stop(timeout=5)
+            display.clear_display()
+        # Let pending notifications finish before their HTTP session is closed
+        try:
+            await asyncio.wait_for(event_emitter.drain(), timeout=150)
+        except asyncio.TimeoutError:
+            print("Warning: Pending notifications did not finish before shutdown")
+        await close_session()
 
-        # Always have a small delay to prevent busy waiting
-        time.sleep(0.1)
 
-finally:
-    GPIO.cleanup()
-    if display:
-        display.clear_display()
+# One event loop for the card loop, emits and all HTTP calls, so the shared
+# HTTP session keeps its connections. Ctrl+C cancels main(), which cleans up.
+with asyncio.Runner(loop_factory=uvloop.new_event_loop if UVLOOP_AVAILABLE else None) as runner:
+    runner.run(main())
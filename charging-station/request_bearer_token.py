@@ -1,14 +1,58 @@
-import requests
+import asyncio
+import time
+
+import aiohttp
+from http_session import get_session
 from nitrobox_config import NitroboxConfig
 
+# Refresh the token this many seconds before it expires
+TOKEN_EXPIRY_MARGIN = 30
+# Assumed lifetime if the token response carries no expires_in
+DEFAULT_TOKEN_LIFETIME = 300
+
+_TOKEN_REQUEST_PARAMS = {
+    "grant_type": "client_credentials"
+}
+
+# Last token and its expiry on the time.monotonic() clock
+_token_cache = {"token": None, "exp": 0.0}
+# Refresh in progress, awaited by all callers
+_refresh_future = None
+
 
-def fetch_bearer_token():
+def invalidate_bearer_token(token):
+    """Drop the cached token if it is token, e.g. after Nitrobox rejected it with 401"""
+    # A request with an older token must not drop a token refreshed in the meantime
+    if _token_cache["token"] == token:
+        _token_cache["exp"] = 0.0
+
+
+async def fetch_bearer_token_async():
     """
     Fetch a bearer token using OAuth2 client credentials flow
 
+    The token is cached until shortly before it expires. A refresh goes through
+    the shared aiohttp session, so it reuses the connection to the Nitrobox host
+    the API calls use. Concurrent callers share one refresh instead of each
+    sending a request.
+
     Returns:
         str: Bearer token if successful, None otherwise
     """
+    global _refresh_future
+
+    if time.monotonic() < _token_cache["exp"]:
+        return _token_cache["token"]
+
+    loop = asyncio.get_running_loop()
+    if _refresh_future is None or _refresh_future.done() or _refresh_future.get_loop() is not loop:
+        _refresh_future = loop.create_task(_request_bearer_token())
+    # A cancelled caller must not cancel the refresh the others are waiting for
+    return await asyncio.shield(_refresh_future)
+
+
+async def _request_bearer_token():
+    """Request a new token from Nitrobox and store it in the cache"""
     # Get configuration from environment
     try:
         config = NitroboxConfig.from_env()
@@ -26,37 +70,31 @@ def fetch_bearer_token():
             "Content-Type": "application/x-www-form-urlencoded"
         }
 
-        params = {
-            "grant_type": "client_credentials"
-        }
-
         print("Fetching new bearer token from Nitrobox...")
 
-        response = requests.post(
-            config.oauth_url,
-            headers=headers,
-            params=params,
-            timeout=30
-        )
-
-        if response.status_code == 200:
-            token_data = response.json()
-            access_token = token_data.get("access_token")
+        session = await get_session()
+        async with session.post(config.oauth_url, headers=headers, params=_TOKEN_REQUEST_PARAMS) as response:
+            if response.status == 200:
+                token_data = await response.json(content_type=None)
+                access_token = token_data.get("access_token")
 
-            if access_token:
-                print("✅ Successfully fetched bearer token")
-                return access_token
+                if access_token:
+                    print("✅ Successfully fetched bearer token")
+                    lifetime = float(token_data.get("expires_in", DEFAULT_TOKEN_LIFETIME))
+                    _token_cache["token"] = access_token
+                    _token_cache["exp"] = time.monotonic() + lifetime - TOKEN_EXPIRY_MARGIN
+                    return access_token
+                else:
+                    print("❌ No access_token in response")
+                    return None
             else:
-                print("❌ No access_token in response")
+                print(f"❌ Failed to fetch bearer token. Status: {response.status}")
+                print(f"   Response: {await response.text()}")
                 return None
-        else:
-            print(f"❌ Failed to fetch bearer token. Status: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return None
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Network error when fetching bearer token: {e}")
         return None
     except Exception as e:
         print(f"Unexpected error when fetching bearer token: {e}")
-        return None 
\ No newline at end of file
+        return None
@@ -1,8 +1,18 @@
-import requests
+import asyncio
 from datetime import datetime, timedelta
+
+import aiohttp
+from http_session import dumps_json, get_session
 from nitrobox_config import NitroboxConfig
+from request_bearer_token import fetch_bearer_token_async, invalidate_bearer_token
+
+# Headers shared by every request, only the Authorization header is added per call
+_HEADERS_JSON_BASE = {
+    "accept": "application/json",
+    "content-type": "application/json"
+}
 
-def create_nitrobox_billing_run(bearer_token, customer_info):
+async def create_nitrobox_billing_run(bearer_token, customer_info):
     """
     Create a billing run in Nitrobox
 
@@ -37,31 +47,33 @@ def create_nitrobox_billing_run(bearer_token, customer_info):
         "processingDate": processing_date
     }
 
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "Authorization": f"Bearer {bearer_token}"
-    }
+    body = dumps_json(billing_data)
 
     try:
         print(f"Creating billing run in Nitrobox...")
 
-        response = requests.post(
-            config.billing_url,
-            headers=headers,
-            json=billing_data,
-            timeout=30
-        )
-
-        if response.status_code == 200 or response.status_code == 201:
-            print("✅ Successfully created billing run in Nitrobox")
-            return True
-        else:
-            print(f"❌ Failed to create billing run. Status: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
+        session = await get_session()
+        # A rejected token is replaced once; no billing run is created on a 401, so resending is safe
+        for attempt in range(2):
+            headers = _HEADERS_JSON_BASE | {"Authorization": f"Bearer {bearer_token}"}
+            async with session.post(config.billing_url, headers=headers, data=body) as response:
+                if response.status == 200 or response.status == 201:
+                    print("✅ Successfully created billing run in Nitrobox")
+                    return True
+                if response.status == 401:
+                    # Token expired or revoked early, fetch a new one
+                    invalidate_bearer_token(bearer_token)
+                    if attempt == 0:
+                        new_token = await fetch_bearer_token_async()
+                        if new_token and new_token != bearer_token:
+                            print("Bearer token rejected, retrying billing run with a new token")
+                            bearer_token = new_token
+                            continue
+                print(f"❌ Failed to create billing run. Status: {response.status}")
+                print(f"   Response: {await response.text()}")
+                return False
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Network error when calling Nitrobox billing API: {e}")
         return False
     except Exception as e:
@@ -1,9 +1,21 @@
-import requests
-from datetime import datetime
+import asyncio
+
+import aiohttp
+from http_session import dumps_json, get_session
 from nitrobox_config import NitroboxConfig
+from request_bearer_token import fetch_bearer_token_async, invalidate_bearer_token
+
+# Headers shared by every request, only the Authorization header is added per call
+_HEADERS_JSON_BASE = {
+    "accept": "application/json",
+    "content-type": "application/json"
+}
 
+# Payload fields that are the same for every usage record, never mutated
+_TAX_LOCATION = {"country": "DE"}
 
-def create_nitrobox_usage(tag_id, charging_start_time, charging_end_time, bearer_token, customer_info, product_ident, button_release_count=None):
+
+async def create_nitrobox_usage(tag_id, charging_start_time, charging_end_time, bearer_token, customer_info, product_ident, button_release_count=None):
     """
     Create a usage record in Nitrobox for the charging session
 
@@ -37,45 +49,34 @@ def create_nitrobox_usage(tag_id, charging_start_time, charging_end_time, bearer
     # Calculate charging duration in seconds
     duration_seconds = int((charging_end_time - charging_start_time).total_seconds())
 
+    # Session times are naive local times; attach the local UTC offset once so the
+    # timestamps carry the offset that actually applied (CET or CEST)
+    start_local = charging_start_time.astimezone()
+    end_local = charging_end_time.astimezone()
+
     # Generate unique usage identifier
-    usage_ident = f"rfid-session-{tag_id}-{int(charging_start_time.timestamp())}"
+    usage_ident = f"rfid-session-{tag_id}-{int(start_local.timestamp())}"
     if button_release_count is not None:
         usage_ident += "-coffee"
 
     # Prepare the usage data according to Nitrobox API schema (matching curl example)
-    unit_quantities = [
-        {
-            "unitQuantity": duration_seconds,
-            "unitQuantityType": "SECOND"
-        }
-    ]
-    
-    # Only add button count if it was provided
+    # Only add button count if it was provided, the charged seconds otherwise
     if button_release_count is not None:
-        unit_quantities = [
-            {
-                "unitQuantity": button_release_count,
-                "unitQuantityType": "PC"
-            }
-        ]
-    
+        unit_quantity = {"unitQuantity": button_release_count, "unitQuantityType": "PC"}
+    else:
+        unit_quantity = {"unitQuantity": duration_seconds, "unitQuantityType": "SECOND"}
+
     usage_data = {
         "productIdent": product_ident,
         "contractId": customer_info.contract_id,
         "usageIdent": usage_ident,
-        "unitQuantities": unit_quantities,
-        "startDate": charging_start_time.isoformat() + "+01:00",
-        "endDate": charging_end_time.isoformat() + "Z",
-        "taxLocation": {
-            "country": "DE"
-        }
+        "unitQuantities": [unit_quantity],
+        "startDate": start_local.isoformat(timespec="seconds"),
+        "endDate": end_local.isoformat(timespec="seconds"),
+        "taxLocation": _TAX_LOCATION
     }
 
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "Authorization": f"Bearer {bearer_token}"
-    }
+    body = dumps_json(usage_data)
 
     try:
         if button_release_count is not None:
@@ -83,22 +84,28 @@ def create_nitrobox_usage(tag_id, charging_start_time, charging_end_time, bearer
         else:
             print(f"Sending usage data to Nitrobox for {duration_seconds} seconds of charging...")
 
-        response = requests.post(
-            config.api_url,
-            headers=headers,
-            json=usage_data,
-            timeout=30
-        )
-
-        if response.status_code == 201:
-            print("✅ Successfully created usage record in Nitrobox")
-            return True
-        else:
-            print(f"❌ Failed to create usage record. Status: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
+        session = await get_session()
+        # A rejected token is replaced once; the usage is not recorded on a 401, so resending is safe
+        for attempt in range(2):
+            headers = _HEADERS_JSON_BASE | {"Authorization": f"Bearer {bearer_token}"}
+            async with session.post(config.api_url, headers=headers, data=body) as response:
+                if response.status == 201:
+                    print("✅ Successfully created usage record in Nitrobox")
+                    return True
+                if response.status == 401:
+                    # Token expired or revoked early, fetch a new one
+                    invalidate_bearer_token(bearer_token)
+                    if attempt == 0:
+                        new_token = await fetch_bearer_token_async()
+                        if new_token and new_token != bearer_token:
+                            print("Bearer token rejected, retrying usage record with a new token")
+                            bearer_token = new_token
+                            continue
+                print(f"❌ Failed to create usage record. Status: {response.status}")
+                print(f"   Response: {await response.text()}")
+                return False
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Network error when calling Nitrobox API: {e}")
         return False
     except Exception as e:
@@ -1,8 +1,12 @@
-import requests
+import asyncio
+
+import aiohttp
+from http_session import get_session
 from nitrobox_config import NitroboxConfig
+from request_bearer_token import invalidate_bearer_token
 
 
-def get_nitrobox_contract(bearer_token, customer_info):
+async def get_nitrobox_contract(bearer_token, customer_info):
     """
     Get contract details from Nitrobox for a specific customer
 
@@ -41,23 +45,22 @@ def get_nitrobox_contract(bearer_token, customer_info):
     try:
         print(f"Getting contract details from Nitrobox for contract ID: {customer_info.contract_id}")
 
-        response = requests.get(
-            contracts_url,
-            headers=headers,
-            timeout=30
-        )
-
-        if response.status_code == 200:
-            print("✅ Successfully retrieved contract details from Nitrobox")
-            contract_data = response.json()
-            print(f"   Contract status: {contract_data.get('status', 'Unknown')}")
-            return contract_data
-        else:
-            print(f"❌ Failed to get contract details. Status: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return None
+        session = await get_session()
+        async with session.get(contracts_url, headers=headers) as response:
+            if response.status == 200:
+                print("✅ Successfully retrieved contract details from Nitrobox")
+                contract_data = await response.json()
+                print(f"   Contract status: {contract_data.get('status', 'Unknown')}")
+                return contract_data
+            else:
+                if response.status == 401:
+                    # Token expired or revoked early, fetch a new one next time
+                    invalidate_bearer_token(bearer_token)
+                print(f"❌ Failed to get contract details. Status: {response.status}")
+                print(f"   Response: {await response.text()}")
+                return None
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Network error when calling Nitrobox contracts API: {e}")
         return None
     except Exception as e:
@@ -1,8 +1,24 @@
-import requests
+import asyncio
+import time
+
+import aiohttp
+from http_session import get_session
 from nitrobox_config import NitroboxConfig
+from request_bearer_token import invalidate_bearer_token
+
+# Contract options rarely change, a re-tapped card skips the contract lookup for this long
+OPTION_IDENTS_CACHE_TTL = 300
+
+# contract_ident -> (expiry on the time.monotonic() clock, option idents)
+_option_idents_cache = {}
+
 
+def invalidate_option_idents(contract_ident):
+    """Drop cached option identifiers, e.g. after the contract was changed in Nitrobox"""
+    _option_idents_cache.pop(contract_ident, None)
 
-def get_nitrobox_contract_details(contract_ident, bearer_token):
+
+async def get_nitrobox_contract_details(contract_ident, bearer_token):
     """
     Get contract details from Nitrobox API for the specified contract
     
@@ -41,24 +57,23 @@ def get_nitrobox_contract_details(contract_ident, bearer_token):
     try:
         print(f"Fetching contract details from Nitrobox for contract: {contract_ident}...")
         
-        response = requests.get(
-            contract_details_url,
-            headers=headers,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            print("✅ Successfully retrieved contract details from Nitrobox")
-            response_data = response.json()
+        session = await get_session()
+        async with session.get(contract_details_url, headers=headers) as response:
+            if response.status == 200:
+                print("✅ Successfully retrieved contract details from Nitrobox")
+                response_data = await response.json()
+                
+                print(f"Response: {response_data}")
+                return response_data
+            else:
+                if response.status == 401:
+                    # Token expired or revoked early, fetch a new one next time
+                    invalidate_bearer_token(bearer_token)
+                print(f"❌ Failed to get contract details. Status: {response.status}")
+                print(f"   Response: {await response.text()}")
+                return None
             
-            print(f"Response: {response_data}")
-            return response_data
-        else:
-            print(f"❌ Failed to get contract details. Status: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return None
-            
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Network error when calling Nitrobox API: {e}")
         return None
     except Exception as e:
@@ -66,9 +81,9 @@ def get_nitrobox_contract_details(contract_ident, bearer_token):
         return None
 
 
-def get_option_idents_from_contract(contract_ident, bearer_token):
+async def get_option_idents_from_contract(contract_ident, bearer_token):
     """
-    Get option identifiers from a contract's details
+    Get option identifiers from a contract's details, cached per contract
     
     Args:
         contract_ident: The contract identifier to retrieve option idents for
@@ -77,9 +92,14 @@ def get_option_idents_from_contract(contract_ident, bearer_token):
     Returns:
         list: List of option identifiers, or empty list if failed/none found
     """
-    contract_details = get_nitrobox_contract_details(contract_ident, bearer_token)
+    cached = _option_idents_cache.get(contract_ident)
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+
+    contract_details = await get_nitrobox_contract_details(contract_ident, bearer_token)
     
     if not contract_details:
+        # Failed lookups are not cached
         return []
     
     option_idents = []
@@ -95,4 +115,5 @@ def get_option_idents_from_contract(contract_ident, bearer_token):
                 option_idents.append(option_ident)
     
     print(f"Found {len(option_idents)} option identifiers: {option_idents}")
+    _option_idents_cache[contract_ident] = (time.monotonic() + OPTION_IDENTS_CACHE_TTL, option_idents)
     return option_idents
\ No newline at end of file
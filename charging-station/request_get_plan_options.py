@@ -1,8 +1,12 @@
-import requests
+import asyncio
+
+import aiohttp
+from http_session import get_session
 from nitrobox_config import NitroboxConfig
+from request_bearer_token import invalidate_bearer_token
 
 
-def get_nitrobox_plan_options(option_ident, bearer_token):
+async def get_nitrobox_plan_options(option_ident, bearer_token):
     """
     Get plan options from Nitrobox API for the specified plan
     
@@ -41,24 +45,23 @@ def get_nitrobox_plan_options(option_ident, bearer_token):
     try:
         print(f"Fetching plan options from Nitrobox for option identifier: {option_ident}...")
         
-        response = requests.get(
-            plan_options_url,
-            headers=headers,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            print("✅ Successfully retrieved plan options from Nitrobox")
-            response_data = response.json()
+        session = await get_session()
+        async with session.get(plan_options_url, headers=headers) as response:
+            if response.status == 200:
+                print("✅ Successfully retrieved plan options from Nitrobox")
+                response_data = await response.json()
 
-            print(f"Response: {response_data}")
-            return response_data
-        else:
-            print(f"❌ Failed to get plan options. Status: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return None
+                print(f"Response: {response_data}")
+                return response_data
+            else:
+                if response.status == 401:
+                    # Token expired or revoked early, fetch a new one next time
+                    invalidate_bearer_token(bearer_token)
+                print(f"❌ Failed to get plan options. Status: {response.status}")
+                print(f"   Response: {await response.text()}")
+                return None
             
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Network error when calling Nitrobox API: {e}")
         return None
     except Exception as e: